@@ -1,12 +1,43 @@
 
 import abc
+import weakref
 from typing import List, Union
-import names
+import memo
 
 import helpers
 
 
+class Signal:
+    # What a statement hands back to end its block early; any other result of a control statement is a return value
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+BREAK = Signal('BREAK')
+CONTINUE = Signal('CONTINUE')
+# returning None would look like a block that ran to its end
+VOID = Signal('VOID')
+
+
 class Node(abc.ABC):
+    # where the node starts in the source, 1-based; None for nodes the optimizer made up
+    __slots__ = ('line', 'column')
+    transfers_control = False
+
+    def __new__(cls, *args, **kwargs):
+        node = super().__new__(cls)
+        node.line = node.column = None
+        return node
+
+    def locate(self, other):
+        self.line, self.column = other.line, other.column
+        return self
+
     def __str__(self, level=0):
         ret = '.   ' * level + self.get_symbol() + '\n'
         for child in self.get_children():
@@ -26,12 +57,44 @@ class Node(abc.ABC):
         pass
 
 
+class Leaf(Node):
+    # Leaves are immutable, so equal ones are shared between all the trees alive in the process, and have no
+    # position of their own
+    __slots__ = ('__weakref__',)
+    line = column = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, value):
+        # 0.0 == -0.0, so floats are told apart by their exact representation
+        key = (value.__class__, value.hex() if value.__class__ is float else value)
+        leaf = cls._interned.get(key)
+        if leaf is None:
+            leaf = cls._interned[key] = object.__new__(cls)
+        return leaf
+
+    def __reduce__(self):
+        return type(self), (getattr(self, type(self).__slots__[0]),)
+
+    def locate(self, other):
+        return self
+
+
 class Program(Node):
+    __slots__ = ('program', 'scope_size')
+
     def __init__(self, program):
         self.program = program
+        self.scope_size = None
 
     def evaluate(self, name_table):
-        self.program.evaluate(name_table)
+        helpers.check_jumps(self)
+        try:
+            self.program.evaluate(name_table)
+        finally:
+            name_table.output.flush()
 
     def get_symbol(self) -> str:
         return super().get_symbol()
@@ -41,14 +104,16 @@ class Program(Node):
 
 
 class Lines(Node):
+    __slots__ = ('lines',)
+
     def __init__(self, lines: List[Node]):
         self.lines = lines
 
     def evaluate(self, name_table):
         for line in self.lines:
-            result = line.evaluate(name_table)
-            if isinstance(line, ReturnStatement):
-                return result
+            signal = line.evaluate(name_table)
+            if signal is not None and line.transfers_control:
+                return signal
 
     def get_symbol(self) -> str:
         return super().get_symbol()
@@ -57,7 +122,9 @@ class Lines(Node):
         return self.lines
 
 
-class Number(Node):
+class Number(Leaf):
+    __slots__ = ('value',)
+
     def __init__(self, value: Union[int, float]):
         self.value = value
 
@@ -72,6 +139,8 @@ class Number(Node):
 
 
 class BinaryMathOperator(Node):
+    __slots__ = ('operation', 'left', 'right')
+
     def __init__(self, operation: str, left, right):
         self.operation = operation
         self.left = left
@@ -103,6 +172,8 @@ class BinaryMathOperator(Node):
 
 
 class UnaryMathOperator(Node):
+    __slots__ = ('operator', 'operand')
+
     def __init__(self, operator, operand):
         self.operator = operator
         self.operand = operand
@@ -121,6 +192,8 @@ class UnaryMathOperator(Node):
 
 
 class BinaryLogicalOperator(Node):
+    __slots__ = ('operation', 'left', 'right')
+
     def __init__(self, operation, left, right):
         self.operation = operation
         self.left = left
@@ -142,6 +215,8 @@ class BinaryLogicalOperator(Node):
 
 
 class UnaryLogicalOperator(Node):
+    __slots__ = ('operator', 'operand')
+
     def __init__(self, operator, operand):
         self.operator = operator
         self.operand = operand
@@ -160,6 +235,8 @@ class UnaryLogicalOperator(Node):
 
 
 class Comparison(Node):
+    __slots__ = ('operation', 'left', 'right')
+
     def __init__(self, operation, left, right):
         self.operation = operation
         self.left = left
@@ -190,10 +267,14 @@ class Comparison(Node):
 
 
 class Declaration(Node):
+    __slots__ = ('type_name', 'var_name', 'is_global', 'address', 'addresses')
+
     def __init__(self, type_name, var_name, is_global=False):
         self.type_name = type_name
         self.var_name = var_name
         self.is_global = is_global
+        self.address = None
+        self.addresses = None
 
     def evaluate(self, name_table):
         type_name = self.type_name.evaluate(name_table)
@@ -210,9 +291,12 @@ class Declaration(Node):
 
 
 class Assignment(Node):
+    __slots__ = ('var_name', 'value', 'addresses')
+
     def __init__(self, var_name, value):
         self.var_name = var_name
         self.value = value
+        self.addresses = None
 
     def evaluate(self, name_table):
         l, r = self.var_name.evaluate(name_table), self.value.evaluate(name_table)
@@ -226,11 +310,15 @@ class Assignment(Node):
 
 
 class DeclarationWithAssignment(Node):
+    __slots__ = ('type_name', 'var_name', 'value', 'is_global', 'address', 'addresses')
+
     def __init__(self, type_name, var_name, value, is_global):
         self.type_name = type_name
         self.var_name = var_name
         self.value = value
         self.is_global = is_global
+        self.address = None
+        self.addresses = None
 
     def evaluate(self, name_table):
         Declaration(self.type_name, self.var_name, self.is_global).evaluate(name_table)
@@ -244,19 +332,25 @@ class DeclarationWithAssignment(Node):
 
 
 class FunctionDeclaration(Node):
+    __slots__ = ('function_name', 'arguments', 'body', 'return_type', 'scope_size', 'pure')
+
     def __init__(self, function_name, arguments, body, return_type):
         self.function_name = function_name
         self.arguments = arguments
         self.body = body
         self.return_type = return_type
+        self.scope_size = None
+        self.pure = False
 
     def evaluate(self, name_table):
         arguments = [(helpers.to_python_type(argument[0]), argument[1]) for argument in self.arguments.evaluate(name_table)]
+        fun_name = self.function_name.evaluate(name_table)
         name_table.declare_function(
-            fun_name=self.function_name.evaluate(name_table),
+            fun_name=fun_name,
             arguments=arguments,
             body=self.body,
             return_type=helpers.to_python_type(self.return_type.evaluate(name_table)),
+            cache=memo.FunctionCache(fun_name) if self.pure else None,
         )
 
     def get_symbol(self) -> str:
@@ -267,6 +361,8 @@ class FunctionDeclaration(Node):
 
 
 class FunctionArguments(Node):
+    __slots__ = ('arguments',)
+
     def __init__(self, arguments):
         self.arguments = arguments
 
@@ -281,6 +377,8 @@ class FunctionArguments(Node):
 
 
 class FunctionArgument(Node):
+    __slots__ = ('type_name', 'arg_name')
+
     def __init__(self, type_name, arg_name):
         self.type_name = type_name
         self.arg_name = arg_name
@@ -296,11 +394,15 @@ class FunctionArgument(Node):
 
 
 class ReturnStatement(Node):
+    __slots__ = ('expression',)
+    transfers_control = True
+
     def __init__(self, expression):
         self.expression = expression
 
     def evaluate(self, name_table):
-        return self.expression.evaluate(name_table)
+        value = self.expression.evaluate(name_table)
+        return VOID if value is None else value
 
     def get_symbol(self) -> str:
         return super().get_symbol()
@@ -310,6 +412,8 @@ class ReturnStatement(Node):
 
 
 class FunctionCall(Node):
+    __slots__ = ('name', 'arguments')
+
     def __init__(self, name, arguments):
         self.name = name
         self.arguments = arguments
@@ -324,8 +428,15 @@ class FunctionCall(Node):
             if (expected_type := matched_arg[0][0]) != (actual_type := matched_arg[1][0]):
                 raise TypeError(f"Type mismatch in argument number {index}: expected {expected_type}, got {actual_type}")
             function_variables[matched_arg[0][1]] = {'type': actual_type, 'value': matched_arg[1][1]}
-        function_name_table = names.NameTable(function_variables, name_table.functions)
-        function_return = function_spec['body'].evaluate(function_name_table)
+        # an instrumented name table makes instrumented ones for the calls it runs
+        function_name_table = type(name_table)(function_variables, name_table.functions, name_table.output)
+        if function_spec['cache'] is None:
+            function_return = function_spec['body'].evaluate(function_name_table)
+        else:
+            function_return = function_spec['cache'].call([value for _, value in call_spec],
+                                                          function_spec['body'].evaluate, function_name_table)
+        if function_return is VOID:
+            function_return = None
         if not isinstance(function_return, function_spec['return_type']):
             raise TypeError(f"Value returned from function is of type {type(function_return)} but expected {function_spec['return_type']}")
         return function_return
@@ -337,7 +448,37 @@ class FunctionCall(Node):
         return [self.name, self.arguments]
 
 
+class Break(Node):
+    __slots__ = ()
+    transfers_control = True
+
+    def evaluate(self, name_table):
+        return BREAK
+
+    def get_symbol(self) -> str:
+        return super().get_symbol()
+
+    def get_children(self) -> List:
+        return []
+
+
+class Continue(Node):
+    __slots__ = ()
+    transfers_control = True
+
+    def evaluate(self, name_table):
+        return CONTINUE
+
+    def get_symbol(self) -> str:
+        return super().get_symbol()
+
+    def get_children(self) -> List:
+        return []
+
+
 class FunctionCallArguments(Node):
+    __slots__ = ('arguments',)
+
     def __init__(self, arguments):
         self.arguments = arguments
 
@@ -351,7 +492,9 @@ class FunctionCallArguments(Node):
         return self.arguments
 
 
-class VariableName(Node):
+class VariableName(Leaf):
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.name = name
 
@@ -365,7 +508,9 @@ class VariableName(Node):
         return []
 
 
-class TypeName(Node):
+class TypeName(Leaf):
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.name = name
 
@@ -380,8 +525,11 @@ class TypeName(Node):
 
 
 class VariableRead(Node):
+    __slots__ = ('name', 'addresses')
+
     def __init__(self, name):
         self.name = name
+        self.addresses = None
 
     def evaluate(self, name_table):
         return name_table.get_variable(self.name)
@@ -393,7 +541,9 @@ class VariableRead(Node):
         return []
 
 
-class String(Node):
+class String(Leaf):
+    __slots__ = ('text',)
+
     def __init__(self, text):
         self.text = text
 
@@ -407,7 +557,9 @@ class String(Node):
         return []
 
 
-class TrueOrFalse(Node):
+class TrueOrFalse(Leaf):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
@@ -422,16 +574,23 @@ class TrueOrFalse(Node):
 
 
 class IfStatement(Node):
+    __slots__ = ('condition', 'statement', 'scope_size')
+    transfers_control = True
+    check_condition = True
+
     def __init__(self, condition, statement):
         self.condition = condition
         self.statement = statement
+        self.scope_size = None
 
     def evaluate(self, name_table):
         condition = self.condition.evaluate(name_table)
-        helpers.check_boolean_type(condition)
+        if self.check_condition:
+            helpers.check_boolean_type(condition)
         if condition:
-            self.statement.evaluate(name_table.add_scope())
-        name_table.remove_scope()
+            signal = self.statement.evaluate(name_table.add_scope())
+            name_table.remove_scope()
+            return signal
 
     def get_symbol(self) -> str:
         return super().get_symbol()
@@ -441,20 +600,27 @@ class IfStatement(Node):
 
 
 class IfElseStatement(Node):
+    __slots__ = ('condition', 'on_true_statement', 'on_false_statement', 'scope_size')
+    transfers_control = True
+    check_condition = True
+
     def __init__(self, condition, on_true_statement, on_false_statement):
         self.condition = condition
         self.on_true_statement = on_true_statement
         self.on_false_statement = on_false_statement
+        self.scope_size = None
 
     def evaluate(self, name_table):
         condition = self.condition.evaluate(name_table)
-        helpers.check_boolean_type(condition)
+        if self.check_condition:
+            helpers.check_boolean_type(condition)
         name_table.add_scope()
         if condition:
-            self.on_true_statement.evaluate(name_table)
+            signal = self.on_true_statement.evaluate(name_table)
         else:
-            self.on_false_statement.evaluate(name_table)
+            signal = self.on_false_statement.evaluate(name_table)
         name_table.remove_scope()
+        return signal
 
     def get_symbol(self) -> str:
         return super().get_symbol()
@@ -464,26 +630,27 @@ class IfElseStatement(Node):
 
 
 class WhileStatement(Node):
+    __slots__ = ('condition', 'statement', 'scope_size')
+    transfers_control = True
+    check_condition = True
+
     def __init__(self, condition, statement):
         self.condition = condition
         self.statement = statement
-        self.constant = None
-        self.constant_evaluated = None
-
-    def evaluate(self, name_table):
-        if self.constant == 'right':
-            self.constant_evaluated = self.condition.right.evaluate(name_table)
-            self.condition = Comparison(self.condition.operation, self.condition.left,
-                                        GenericExpression(self.constant_evaluated))
-        elif self.constant == 'left':
-            self.constant_evaluated = self.condition.left.evaluate(name_table)
-            self.condition = Comparison(self.condition.operation, GenericExpression(self.constant_evaluated),
-                                        self.condition.right)
+        self.scope_size = None
+
+    def evaluate(self, name_table):
         condition = self.condition.evaluate(name_table)
-        helpers.check_boolean_type(condition)
+        if self.check_condition:
+            helpers.check_boolean_type(condition)
         while condition:
-            self.statement.evaluate(name_table.add_scope())
+            signal = self.statement.evaluate(name_table.add_scope())
             name_table.remove_scope()
+            if signal is not None:
+                if signal is BREAK:
+                    break
+                if signal is not CONTINUE:
+                    return signal
             condition = self.condition.evaluate(name_table)
 
     def get_symbol(self) -> str:
@@ -492,16 +659,15 @@ class WhileStatement(Node):
     def get_children(self) -> List:
         return [self.condition, self.statement]
 
-    def set_constant(self, side: str):
-        self.constant = side
-
 
 class Print(Node):
+    __slots__ = ('expression',)
+
     def __init__(self, expression):
         self.expression = expression
 
     def evaluate(self, name_table):
-        print(self.expression.evaluate(name_table))
+        name_table.output.print(self.expression.evaluate(name_table))
 
     def get_symbol(self) -> str:
         return super().get_symbol()
@@ -511,6 +677,8 @@ class Print(Node):
 
 
 class IntToFloat(Node):
+    __slots__ = ('number',)
+
     def __init__(self, number):
         self.number = number
 
@@ -527,6 +695,8 @@ class IntToFloat(Node):
 
 
 class FloatToInt(Node):
+    __slots__ = ('number',)
+
     def __init__(self, number):
         self.number = number
 
@@ -543,6 +713,8 @@ class FloatToInt(Node):
 
 
 class GenericExpression(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
@@ -553,4 +725,77 @@ class GenericExpression(Node):
         return f'{super().get_symbol()}({self.value})'
 
     def get_children(self) -> List:
-        return []
\ No newline at end of file
+        return []
+
+
+class UncheckedBinaryMathOperator(BinaryMathOperator):
+    __slots__ = ('apply',)
+
+    def __init__(self, operation: str, left, right):
+        super().__init__(operation, left, right)
+        self.apply = helpers.math_operators[operation]
+
+    def evaluate(self, name_table):
+        return self.apply(self.left.evaluate(name_table), self.right.evaluate(name_table))
+
+
+class UncheckedComparison(Comparison):
+    __slots__ = ('apply',)
+
+    def __init__(self, operation, left, right):
+        super().__init__(operation, left, right)
+        self.apply = helpers.comparison_operators[operation]
+
+    def evaluate(self, name_table):
+        return self.apply(self.left.evaluate(name_table), self.right.evaluate(name_table))
+
+
+class UncheckedBinaryLogicalOperator(BinaryLogicalOperator):
+    __slots__ = ()
+
+    def evaluate(self, name_table):
+        l, r = self.left.evaluate(name_table), self.right.evaluate(name_table)
+        return (l and r) if self.operation == '&&' else (l or r)
+
+
+class UncheckedUnaryMathOperator(UnaryMathOperator):
+    __slots__ = ()
+
+    def evaluate(self, name_table):
+        return -self.operand.evaluate(name_table)
+
+
+class UncheckedUnaryLogicalOperator(UnaryLogicalOperator):
+    __slots__ = ()
+
+    def evaluate(self, name_table):
+        return not self.operand.evaluate(name_table)
+
+
+class UncheckedIntToFloat(IntToFloat):
+    __slots__ = ()
+
+    def evaluate(self, name_table):
+        return float(self.number.evaluate(name_table))
+
+
+class UncheckedFloatToInt(FloatToInt):
+    __slots__ = ()
+
+    def evaluate(self, name_table):
+        return int(self.number.evaluate(name_table))
+
+
+class UncheckedIfStatement(IfStatement):
+    __slots__ = ()
+    check_condition = False
+
+
+class UncheckedIfElseStatement(IfElseStatement):
+    __slots__ = ()
+    check_condition = False
+
+
+class UncheckedWhileStatement(WhileStatement):
+    __slots__ = ()
+    check_condition = False
@@ -0,0 +1,74 @@
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import names
+import optimize
+import parse
+import typecheck
+from main import engines
+
+PROGRAM = '''
+int square(int x) {
+    return x * x
+}
+int add(int a, int b) {
+    return a + b
+}
+int clamp(int v, int limit) {
+    return v % limit
+}
+boolean even(int n) {
+    return n % 2 = 0
+}
+float scale(float f) {
+    return f * 0.5
+}
+int i := 0
+int total := 0
+float acc := 0.0
+while (i < ITERATIONS) {
+    total := clamp(add(total, square(i) + add(i, 3)), 1000003)
+    if (even(i)) {
+        acc := scale(acc) + 1.0
+    }
+    i := i + 1
+}
+print(total)
+print(acc)
+'''
+
+
+def compile_program(code, **options):
+    root = optimize.fold_constants(parse.parse(code))
+    root = optimize.fold_constants(optimize.inline_functions(root, **options))
+    return typecheck.specialize(root)
+
+
+def measure(root, engine):
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        engines[engine](root, names.NameTable())
+    return time.perf_counter() - start, output.getvalue()
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    code = PROGRAM.replace('ITERATIONS', str(iterations))
+    options = {'max_size': int(sys.argv[2])} if len(sys.argv) > 2 else {}
+    print(f"{'engine':>8} {'calls':>10} {'inlined':>10} {'speedup':>8}")
+    for engine in engines:
+        called, called_output = measure(compile_program(code, max_size=0), engine)
+        inlined, inlined_output = measure(compile_program(code, **options), engine)
+        if called_output != inlined_output:
+            raise AssertionError(f'{engine} prints different results once functions are inlined')
+        print(f'{engine:>8} {called:>9.3f}s {inlined:>9.3f}s {called / inlined:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parse
+
+
+def generate_program(units):
+    lines = []
+    for unit in range(units):
+        lines += [
+            f'int f{unit}(int a, int b) {{',
+            f'    int c := a * b + {unit}',
+            '    if (c > 100) { c := c - 100 }',
+            '    return c',
+            '}',
+            f'int x{unit} := {unit}',
+            f'float y{unit} := 1.5',
+            f'string s{unit} := "unit"',
+            f'while (x{unit} < {unit} + 10) {{',
+            f'    x{unit} := x{unit} + f{unit}(x{unit}, 2)',
+            f'    y{unit} := y{unit} / 2.0',
+            '}',
+            f'print(s{unit} + "done")',
+        ]
+    return '\n'.join(lines) + '\n'
+
+
+def count_nodes(root):
+    positions, unique, stack = 0, set(), [root]
+    while stack:
+        node = stack.pop()
+        positions += 1
+        unique.add(id(node))
+        stack.extend(node.get_children())
+    return positions, len(unique)
+
+
+def measure(units):
+    code = generate_program(units)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    root = parse.parse(code)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    positions, unique = count_nodes(root)
+    return positions, unique, retained
+
+
+def main():
+    print(f"{'units':>8} {'nodes':>10} {'objects':>10} {'bytes':>12} {'bytes/node':>11}")
+    for units in (100, 1000, 5000):
+        positions, unique, retained = measure(units)
+        print(f'{units:>8} {positions:>10} {unique:>10} {retained:>12} {retained / positions:>11.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROGRAM = r'''
+import time
+start = time.perf_counter()
+import closures
+import names
+import parse
+root = parse.parse('int x := 40\nprint(x + 2)\n')
+closures.execute(root, names.NameTable())
+print(f'startup {time.perf_counter() - start}')
+'''
+
+
+def measure(runs):
+    latencies = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', PROGRAM], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout
+        latencies.append(float(output.split('startup ')[-1]))
+    return latencies
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latencies = measure(runs)
+    print(f'import to first result over {runs} runs: median {statistics.median(latencies) * 1000:.1f} ms, '
+          f'min {min(latencies) * 1000:.1f} ms, max {max(latencies) * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lex
+import names
+import optimize
+import parse
+import typecheck
+from main import compile_tree, engines
+
+WORKLOADS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'workloads')
+
+levels = {
+    'none': typecheck.specialize,
+    'fold': lambda root: typecheck.specialize(optimize.fold_constants(root)),
+    # the whole pipeline real runs pay for, type check included
+    'full': lambda root: compile_tree(root)[0],
+}
+
+
+def generate_program(units):
+    # like the source memory.py parses, but every loop ends, so it can be run as well
+    lines = []
+    for unit in range(units):
+        lines += [
+            f'int f{unit}(int a, int b) {{',
+            f'    int c := a * b + {unit}',
+            '    if (c > 100) { c := c - 100 }',
+            '    return c',
+            '}',
+            f'int x{unit} := 1',
+            f'float y{unit} := 1.5',
+            f'string s{unit} := "unit"',
+            f'while (x{unit} < {unit % 50} + 10) {{',
+            f'    x{unit} := x{unit} + f{unit}(x{unit}, 2)',
+            f'    y{unit} := y{unit} / 2.0',
+            '}',
+            f'print(s{unit} + "done")',
+            f'print(x{unit})',
+        ]
+    return '\n'.join(lines) + '\n'
+
+
+def load_workloads(units):
+    workloads = {}
+    for filename in sorted(glob.glob(os.path.join(WORKLOADS, '*.orl'))):
+        with open(filename, 'r') as file:
+            workloads[os.path.splitext(os.path.basename(filename))[0]] = file.read()
+    workloads['generated'] = generate_program(units)
+    return workloads
+
+
+def tokenize(code):
+    lexer = lex.get_lexer()
+    lexer.input(code)
+    while lexer.token():
+        pass
+
+
+def run(root, engine):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        engines[engine](root, names.NameTable())
+    return output.getvalue()
+
+
+def measure(function, setup, repeat):
+    # the best of several runs, then one more under tracemalloc for the peak memory it allocates, which it would
+    # slow down too much to time
+    best = None
+    for _ in range(repeat):
+        argument = setup()
+        start = time.perf_counter()
+        result = function(argument)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    argument = setup()
+    tracemalloc.start()
+    function(argument)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def benchmark(name, code, engine_names, repeat):
+    results, outputs = {}, {}
+    results[f'{name}/lex'] = measure(tokenize, lambda: code, repeat)[:2]
+    results[f'{name}/parse'] = measure(parse.parse, lambda: code, repeat)[:2]
+    for level, passes in levels.items():
+        # the passes rewrite the tree they are given, so every run starts from a fresh parse
+        seconds, peak, root = measure(passes, lambda: parse.parse(code), repeat)
+        results[f'{name}/optimize:{level}'] = seconds, peak
+        for engine in engine_names:
+            seconds, peak, outputs[level, engine] = measure(lambda root: run(root, engine), lambda: root, repeat)
+            results[f'{name}/run:{level}:{engine}'] = seconds, peak
+    return results, outputs
+
+
+def compare_outputs(name, outputs):
+    reference_key = next(iter(outputs))
+    mismatches = 0
+    for key, output in outputs.items():
+        if output != outputs[reference_key]:
+            mismatches += 1
+            print(f"{name} prints different results with optimization '{key[0]}' on '{key[1]}' than with "
+                  f"'{reference_key[0]}' on '{reference_key[1]}'")
+    return mismatches
+
+
+def find_regressions(results, baseline, threshold):
+    # timings under a millisecond are mostly noise, so they are never counted as regressions
+    regressions = []
+    for key, (seconds, _) in results.items():
+        previous = baseline.get(key)
+        if previous is not None and previous >= 0.001 and seconds > previous * (1 + threshold):
+            regressions.append((key, previous, seconds))
+    return regressions
+
+
+def find_slow_vm(results, names):
+    # the VM has to be worth compiling to: on the written workloads, which run long enough for running to outweigh
+    # compiling, it must not be slower than the tree walker at any optimization level
+    slow = []
+    for name in names:
+        for level in levels:
+            tree, vm_ = results.get(f'{name}/run:{level}:tree'), results.get(f'{name}/run:{level}:vm')
+            if tree is not None and vm_ is not None and vm_[0] > tree[0]:
+                slow.append((f'{name}/run:{level}', tree[0], vm_[0]))
+    return slow
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Times lexing, parsing, optimization and execution of the workloads')
+    parser.add_argument('workloads', nargs='*', help='names of the workloads to run, all of them by default')
+    parser.add_argument('--engines', default=','.join(engines), help='comma separated engines to run')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement, the fastest one counts')
+    parser.add_argument('--units', type=int, default=200, help='size of the generated workload')
+    parser.add_argument('--baseline', help='JSON file of earlier timings to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='fail when a timing is slower than the baseline by more than this fraction')
+    parser.add_argument('--save', help='write the timings to this JSON file to use as a baseline later')
+    args = parser.parse_args()
+
+    engine_names = args.engines.split(',')
+    for engine in engine_names:
+        if engine not in engines:
+            parser.error(f"unknown engine '{engine}'")
+    workloads = load_workloads(args.units)
+    for name in args.workloads:
+        if name not in workloads:
+            parser.error(f"unknown workload '{name}'")
+
+    results, failures = {}, 0
+    print(f"{'measurement':<40} {'ms':>10} {'peak KiB':>10}")
+    for name, code in workloads.items():
+        if args.workloads and name not in args.workloads:
+            continue
+        workload_results, outputs = benchmark(name, code, engine_names, args.repeat)
+        for key, (seconds, peak) in workload_results.items():
+            print(f'{key:<40} {seconds * 1000:>10.2f} {peak / 1024:>10.1f}')
+        failures += compare_outputs(name, outputs)
+        results.update(workload_results)
+
+    written = [name for name in workloads if name != 'generated']
+    for key, tree, vm_ in find_slow_vm(results, written):
+        print(f'{key} is slower on the VM than on the tree walker: {vm_ * 1000:.2f} ms against {tree * 1000:.2f} ms')
+        failures += 1
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)
+        regressions = find_regressions(results, baseline, args.threshold)
+        for key, previous, seconds in regressions:
+            print(f'{key} regressed: {previous * 1000:.2f} ms -> {seconds * 1000:.2f} ms '
+                  f'({seconds / previous - 1:+.0%}, threshold {args.threshold:+.0%})')
+        failures += len(regressions)
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({key: seconds for key, (seconds, _) in results.items()}, file, indent=2, sort_keys=True)
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if main() else 0)
@@ -0,0 +1,451 @@
+import marshal
+import math
+from array import array
+
+import ast
+import helpers
+import resolve
+
+MAGIC = b'KUBC'
+VERSION = 6
+
+(
+    LOAD_CONST, LOAD_VAR, LOAD_TEMP, STORE_TEMP, STORE_VAR, DECLARE, POP,
+    BINARY_MATH, MATH_CONST, COMPARE, LOGICAL, NEGATE, NOT, INT_TO_FLOAT, FLOAT_TO_INT, CHECK_BOOL,
+    JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE, ENTER_SCOPE, EXIT_SCOPE, PRINT,
+    DECLARE_FUNCTION, LOAD_FUNCTION, CALL, RETURN,
+    LOAD_SLOT_SLOT, LOAD_SLOT_CONST, COMPARE_JUMP_IF_FALSE, COMPARE_JUMP_IF_TRUE,
+    TAIL_CALL, YIELD, CHARGE, LOAD_SLOT, STORE_SLOT, LOAD_SLOTS, STORE_SLOTS,
+) = range(37)
+
+opnames = [
+    'LOAD_CONST', 'LOAD_VAR', 'LOAD_TEMP', 'STORE_TEMP', 'STORE_VAR', 'DECLARE', 'POP',
+    'BINARY_MATH', 'MATH_CONST', 'COMPARE', 'LOGICAL', 'NEGATE', 'NOT', 'INT_TO_FLOAT', 'FLOAT_TO_INT', 'CHECK_BOOL',
+    'JUMP', 'JUMP_IF_FALSE', 'JUMP_IF_TRUE', 'ENTER_SCOPE', 'EXIT_SCOPE', 'PRINT',
+    'DECLARE_FUNCTION', 'LOAD_FUNCTION', 'CALL', 'RETURN',
+    'LOAD_SLOT_SLOT', 'LOAD_SLOT_CONST', 'COMPARE_JUMP_IF_FALSE', 'COMPARE_JUMP_IF_TRUE',
+    'TAIL_CALL', 'YIELD', 'CHARGE', 'LOAD_SLOT', 'STORE_SLOT', 'LOAD_SLOTS', 'STORE_SLOTS',
+]
+
+argument_counts = [
+    1, 1, 1, 1, 1, 1, 0,
+    1, 2, 1, 1, 0, 0, 0, 0, 0,
+    1, 1, 1, 2, 0, 0,
+    1, 1, 2, 0,
+    2, 2, 2, 2,
+    2, 0, 1, 1, 1, 1, 1,
+]
+
+math_operations = ['+', '-', '*', '/', '^', '%']
+comparison_operations = ['=', '≠', '>', '>=', '<', '<=']
+logical_operations = ['&&', '||']
+# operations the type checker proved valid are numbered after the checked ones and run without checks
+_unchecked = {ast.UncheckedBinaryMathOperator: len(math_operations), ast.UncheckedComparison: len(comparison_operations)}
+
+
+def get_operation(node, operations):
+    return operations.index(node.operation) + _unchecked.get(type(node), 0)
+
+
+def get_operation_name(index, operations):
+    name = operations[index % len(operations)]
+    return name if index < len(operations) else f'{name} unchecked'
+
+_constant_nodes = (ast.Number, ast.String, ast.TrueOrFalse, ast.GenericExpression)
+
+
+class Code:
+    # Variables the resolver places live in a flat list of slots per call, every block with a range of its own;
+    # names holds only those it cannot place, which are looked up by name in the name table the code runs on
+    def __init__(self, name, ops, consts, names, temps, slot_names, scope_size):
+        self.name = name
+        self.ops = ops
+        self.consts = consts
+        self.names = names
+        self.temps = temps
+        self.slot_names = slot_names
+        # the slots of the outermost scope, the program's variables or a function's arguments and locals
+        self.scope_size = scope_size
+
+    def __str__(self):
+        return disassemble(self)
+
+
+class Label:
+    def __init__(self):
+        self.position = None
+        self.references = []
+
+
+class Assembler:
+    def __init__(self, name, metered=False):
+        self.name = name
+        self.ops = array('l')
+        self.consts = []
+        self.names = []
+        # where every constant and name already is, so long programs do not search the lists
+        self.const_indexes = {}
+        self.name_indexes = {}
+        self.temps = 0
+        self.slot_names = []
+        self.scope_size = 0
+        # when metered, every basic block starts with a CHARGE of the instructions in it; this is where the
+        # count of the open block is, None between a jump and the next instruction
+        self.metered = metered
+        self.block = None
+
+    def emit(self, op, *args):
+        if self.metered:
+            if self.block is None:
+                self.ops.extend((CHARGE, 0))
+                self.block = len(self.ops) - 1
+            self.ops[self.block] += 1
+        self.ops.append(op)
+        self.ops.extend(args)
+
+    def emit_jump(self, op, label, *args):
+        self.emit(op, *args, -1)
+        self.block = None
+        if label.position is None:
+            label.references.append(len(self.ops) - 1)
+        else:
+            self.ops[-1] = label.position
+
+    def bind(self, label):
+        self.block = None
+        label.position = len(self.ops)
+        for reference in label.references:
+            self.ops[reference] = label.position
+
+    def const(self, value):
+        # 1, 1.0 and True are equal, as are 0.0 and -0.0, but they are different constants
+        key = (type(value), value, math.copysign(1, value) if type(value) is float else None)
+        if key not in self.const_indexes:
+            self.const_indexes[key] = len(self.consts)
+            self.consts.append(value)
+        return self.const_indexes[key]
+
+    def name_index(self, name):
+        if name not in self.name_indexes:
+            self.name_indexes[name] = len(self.names)
+            self.names.append(name)
+        return self.name_indexes[name]
+
+    def temp(self):
+        self.temps += 1
+        return self.temps - 1
+
+    def slots(self, size):
+        self.slot_names.extend([None] * size)
+        return len(self.slot_names) - size
+
+    def assemble(self):
+        return Code(self.name, self.ops, self.consts, self.names, self.temps, self.slot_names, self.scope_size)
+
+
+class Compiler:
+    def __init__(self, name='<program>', yielding=False, metered=False):
+        self.asm = Assembler(name, metered)
+        # whether loops and function bodies start with a YIELD, a point where a coroutine run may pause
+        self.yielding = yielding
+        self.metered = metered
+        self.in_function = False
+        self.scopes = 0
+        # the first slot of every scope around the code being compiled, by the depth the resolver gives it
+        self.offsets = []
+        # the break label, continue label and scope depth of every loop around the code being compiled
+        self.loops = []
+
+    def compile_program(self, root):
+        self.open_scope(root.scope_size)
+        self.asm.scope_size = root.scope_size
+        self.compile_lines(root.program)
+        self.asm.emit(LOAD_CONST, self.asm.const(None))
+        self.asm.emit(RETURN)
+        return self.asm.assemble()
+
+    def compile_function(self, node):
+        self.in_function = True
+        self.open_scope(node.scope_size)
+        self.asm.scope_size = node.scope_size
+        # the resolver gives the arguments the first slots, in order
+        for index, argument in enumerate(node.arguments.arguments):
+            self.asm.slot_names[index] = argument.arg_name.name
+        if self.yielding:
+            self.asm.emit(YIELD)
+        self.compile_lines(node.body)
+        self.asm.emit(LOAD_CONST, self.asm.const(None))
+        self.asm.emit(RETURN)
+        return self.asm.assemble()
+
+    def compile_lines(self, node):
+        for line in node.lines:
+            if isinstance(line, ast.ReturnStatement):
+                self.compile_return(line)
+                return
+            if isinstance(line, (ast.Break, ast.Continue)):
+                break_label, continue_label, scopes = self.loops[-1]
+                for _ in range(self.scopes - scopes):
+                    self.asm.emit(EXIT_SCOPE)
+                self.asm.emit_jump(JUMP, break_label if isinstance(line, ast.Break) else continue_label)
+                return
+            self.compile_statement(line)
+
+    def compile_return(self, line):
+        if self.in_function and isinstance(line.expression, ast.FunctionCall):
+            # the VM runs TAIL_CALL as a plain call when it cannot reuse the frame, so RETURN still follows
+            self.compile_call(line.expression, TAIL_CALL)
+        else:
+            self.compile_expression(line.expression)
+        self.asm.emit(RETURN)
+
+    def open_scope(self, size):
+        offset = self.asm.slots(size)
+        self.offsets.append(offset)
+        return offset
+
+    def get_slot(self, address, name):
+        depth, slot = address
+        index = self.offsets[depth] + slot
+        self.asm.slot_names[index] = name
+        return index
+
+    def get_slots(self, node, name):
+        return tuple(self.get_slot(address, name) for address in node.addresses)
+
+    def compile_block(self, owner, node):
+        # every run of a block starts with its slots cleared, like the fresh scope the tree walker gives it
+        size = owner.scope_size
+        self.asm.emit(ENTER_SCOPE, self.open_scope(size), size)
+        self.scopes += 1
+        self.compile_lines(node)
+        self.scopes -= 1
+        self.offsets.pop()
+        self.asm.emit(EXIT_SCOPE)
+
+    def compile_statement(self, node):
+        asm = self.asm
+        if isinstance(node, ast.Declaration):
+            self.compile_declaration(node)
+        elif isinstance(node, ast.Assignment):
+            self.compile_expression(node.value)
+            self.compile_store(node)
+        elif isinstance(node, ast.DeclarationWithAssignment):
+            self.compile_declaration(node)
+            self.compile_expression(node.value)
+            # the variable was just declared in its own slot, so nothing can hide it
+            asm.emit(STORE_SLOT, self.get_slot(node.address, node.var_name.name))
+        elif isinstance(node, ast.FunctionDeclaration):
+            arguments = tuple((argument[0], argument[1]) for argument in node.arguments.evaluate(None))
+            body = Compiler(node.function_name.name, self.yielding, self.metered).compile_function(node)
+            spec = (node.function_name.name, arguments, body, node.return_type.name, node.pure)
+            asm.consts.append(spec)
+            asm.emit(DECLARE_FUNCTION, len(asm.consts) - 1)
+        elif isinstance(node, ast.FunctionCall):
+            self.compile_expression(node)
+            asm.emit(POP)
+        elif isinstance(node, ast.IfStatement):
+            end = Label()
+            self.compile_condition(node.condition, end)
+            self.compile_block(node, node.statement)
+            asm.bind(end)
+        elif isinstance(node, ast.IfElseStatement):
+            on_false, end = Label(), Label()
+            self.compile_condition(node.condition, on_false)
+            self.compile_block(node, node.on_true_statement)
+            asm.emit_jump(JUMP, end)
+            asm.bind(on_false)
+            self.compile_block(node, node.on_false_statement)
+            asm.bind(end)
+        elif isinstance(node, ast.WhileStatement):
+            self.compile_while(node)
+        elif isinstance(node, ast.Print):
+            self.compile_expression(node.expression)
+            asm.emit(PRINT)
+        else:
+            raise TypeError(f"Node {node.get_symbol()} cannot be compiled")
+
+    def compile_declaration(self, node):
+        type_name, name = node.type_name.name, node.var_name.name
+        # the slot to declare, and every slot the name may already be declared in
+        declaration = (name, None if type_name == 'void' else type_name, self.get_slot(node.address, name),
+                       self.get_slots(node, name))
+        self.asm.emit(DECLARE, self.asm.const(declaration))
+
+    def compile_load(self, node):
+        # a name the resolver found no declaration of is looked up in the name table, where an embedder may have
+        # put it
+        asm = self.asm
+        if not node.addresses:
+            asm.emit(LOAD_VAR, asm.name_index(node.name))
+        elif len(node.addresses) == 1:
+            asm.emit(LOAD_SLOT, self.get_slot(node.addresses[0], node.name))
+        else:
+            asm.emit(LOAD_SLOTS, asm.const((node.name, self.get_slots(node, node.name))))
+
+    def compile_store(self, node):
+        asm, name = self.asm, node.var_name.name
+        if not node.addresses:
+            asm.emit(STORE_VAR, asm.name_index(name))
+        elif len(node.addresses) == 1:
+            asm.emit(STORE_SLOT, self.get_slot(node.addresses[0], name))
+        else:
+            asm.emit(STORE_SLOTS, asm.const((name, self.get_slots(node, name))))
+
+    def is_slot_read(self, node):
+        return isinstance(node, ast.VariableRead) and len(node.addresses) == 1
+
+    def compile_condition(self, node, on_false):
+        if isinstance(node, ast.Comparison):
+            self.compile_operands(node.left, node.right)
+            self.asm.emit_jump(COMPARE_JUMP_IF_FALSE, on_false, get_operation(node, comparison_operations))
+        else:
+            self.compile_expression(node)
+            self.asm.emit(CHECK_BOOL)
+            self.asm.emit_jump(JUMP_IF_FALSE, on_false)
+
+    def compile_while(self, node):
+        asm = self.asm
+        condition = node.condition
+        loop, step, end = Label(), Label(), Label()
+        self.compile_condition(condition, end)
+        asm.bind(loop)
+        if self.yielding:
+            asm.emit(YIELD)
+        self.loops.append((end, step, self.scopes))
+        self.compile_block(node, node.statement)
+        self.loops.pop()
+        asm.bind(step)
+        if isinstance(condition, ast.Comparison):
+            self.compile_operands(condition.left, condition.right)
+            asm.emit_jump(COMPARE_JUMP_IF_TRUE, loop, get_operation(condition, comparison_operations))
+        else:
+            self.compile_expression(condition)
+            asm.emit_jump(JUMP_IF_TRUE, loop)
+        asm.bind(end)
+
+    def compile_operands(self, left, right):
+        asm = self.asm
+        if self.is_slot_read(left) and self.is_slot_read(right):
+            asm.emit(LOAD_SLOT_SLOT, self.get_slot(left.addresses[0], left.name),
+                     self.get_slot(right.addresses[0], right.name))
+        elif self.is_slot_read(left) and isinstance(right, _constant_nodes):
+            asm.emit(LOAD_SLOT_CONST, self.get_slot(left.addresses[0], left.name), asm.const(right.evaluate(None)))
+        else:
+            self.compile_expression(left)
+            self.compile_expression(right)
+
+    def compile_expression(self, node):
+        asm = self.asm
+        if isinstance(node, _constant_nodes):
+            asm.emit(LOAD_CONST, asm.const(node.evaluate(None)))
+        elif isinstance(node, ast.VariableRead):
+            self.compile_load(node)
+        elif isinstance(node, ast.BinaryMathOperator):
+            operation = get_operation(node, math_operations)
+            if isinstance(node.right, _constant_nodes):
+                self.compile_expression(node.left)
+                asm.emit(MATH_CONST, operation, asm.const(node.right.evaluate(None)))
+            else:
+                self.compile_operands(node.left, node.right)
+                asm.emit(BINARY_MATH, operation)
+        elif isinstance(node, ast.Comparison):
+            self.compile_operands(node.left, node.right)
+            asm.emit(COMPARE, get_operation(node, comparison_operations))
+        elif isinstance(node, ast.BinaryLogicalOperator):
+            self.compile_operands(node.left, node.right)
+            asm.emit(LOGICAL, logical_operations.index(node.operation))
+        elif isinstance(node, ast.UnaryMathOperator):
+            self.compile_expression(node.operand)
+            asm.emit(NEGATE)
+        elif isinstance(node, ast.UnaryLogicalOperator):
+            self.compile_expression(node.operand)
+            asm.emit(NOT)
+        elif isinstance(node, ast.IntToFloat):
+            self.compile_expression(node.number)
+            asm.emit(INT_TO_FLOAT)
+        elif isinstance(node, ast.FloatToInt):
+            self.compile_expression(node.number)
+            asm.emit(FLOAT_TO_INT)
+        elif isinstance(node, ast.FunctionCall):
+            self.compile_call(node, CALL)
+        else:
+            raise TypeError(f"Node {node.get_symbol()} cannot be compiled")
+
+    def compile_call(self, node, op):
+        asm = self.asm
+        asm.emit(LOAD_FUNCTION, asm.const(node.name.name))
+        for argument in node.arguments.arguments:
+            self.compile_expression(argument)
+        asm.emit(op, len(node.arguments.arguments), asm.const(str(node.name)))
+
+
+def compile_program(root, yielding=False, metered=False):
+    helpers.check_jumps(root)
+    return Compiler(yielding=yielding, metered=metered).compile_program(resolve.resolve(root))
+
+
+def _to_marshal(code):
+    consts = []
+    for const in code.consts:
+        if isinstance(const, tuple) and len(const) == 5 and isinstance(const[2], Code):
+            const = (const[0], const[1], _to_marshal(const[2]), const[3], const[4])
+        consts.append(const)
+    return code.name, code.ops.typecode, code.ops.tobytes(), tuple(consts), tuple(code.names), code.temps, \
+        tuple(code.slot_names), code.scope_size
+
+
+def _from_marshal(data):
+    name, typecode, ops, consts, code_names, temps, slot_names, scope_size = data
+    consts = [(const[0], const[1], _from_marshal(const[2]), const[3], const[4])
+              if isinstance(const, tuple) and len(const) == 5 and isinstance(const[2], tuple) else const
+              for const in consts]
+    return Code(name, array(typecode, ops), consts, list(code_names), temps, list(slot_names), scope_size)
+
+
+def dumps(code):
+    return MAGIC + bytes([VERSION]) + marshal.dumps(_to_marshal(code))
+
+
+def loads(data):
+    if data[:len(MAGIC)] != MAGIC or data[len(MAGIC)] != VERSION:
+        raise ValueError("Not a compiled kublang program or compiled by another version")
+    return _from_marshal(marshal.loads(data[len(MAGIC) + 1:]))
+
+
+def disassemble(code):
+    ret = f'Code({code.name})\n'
+    nested = []
+    pc = 0
+    while pc < len(code.ops):
+        op = code.ops[pc]
+        args = list(code.ops[pc + 1:pc + 1 + argument_counts[op]])
+        if op in (DECLARE_FUNCTION,):
+            nested.append(code.consts[args[0]][2])
+            args[0] = code.consts[args[0]][0]
+        elif op in (LOAD_CONST, DECLARE, LOAD_FUNCTION):
+            args[0] = repr(code.consts[args[0]])
+        elif op in (LOAD_VAR, STORE_VAR):
+            args[0] = code.names[args[0]]
+        elif op in (LOAD_SLOT, STORE_SLOT):
+            args[0] = f'{args[0]} ({code.slot_names[args[0]]})'
+        elif op in (LOAD_SLOTS, STORE_SLOTS):
+            name, slots = code.consts[args[0]]
+            args = [f'{" ".join(str(slot) for slot in slots)} ({name})']
+        elif op == LOAD_SLOT_SLOT:
+            args = [f'{args[0]} ({code.slot_names[args[0]]})', f'{args[1]} ({code.slot_names[args[1]]})']
+        elif op == LOAD_SLOT_CONST:
+            args = [f'{args[0]} ({code.slot_names[args[0]]})', repr(code.consts[args[1]])]
+        elif op == MATH_CONST:
+            args = [get_operation_name(args[0], math_operations), repr(code.consts[args[1]])]
+        elif op in (BINARY_MATH,):
+            args[0] = get_operation_name(args[0], math_operations)
+        elif op in (COMPARE, COMPARE_JUMP_IF_FALSE, COMPARE_JUMP_IF_TRUE):
+            args[0] = get_operation_name(args[0], comparison_operations)
+        elif op in (CALL, TAIL_CALL):
+            args = args[:1]
+        ret += f'{pc:>6} {opnames[op]:<22} {" ".join(str(arg) for arg in args)}\n'
+        pc += 1 + argument_counts[op]
+    for function in nested:
+        ret += '\n' + disassemble(function)
+    return ret
@@ -0,0 +1,103 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+MAGIC = b'KUBP'
+# a SHA-256 of the pickled entry follows MAGIC, so a damaged file is never unpickled
+_digest_size = hashlib.sha256().digest_size
+
+# the front end modules whose code decides what a cached program looks like, main for the order of the passes
+_compiler_modules = ('ast', 'helpers', 'inference', 'lex', 'main', 'optimize', 'parse', 'parsetab', 'typecheck')
+_compiler_version = None
+
+
+def compiler_version():
+    global _compiler_version
+    if _compiler_version is None:
+        digest = hashlib.sha256(sys.implementation.cache_tag.encode())
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for module in _compiler_modules:
+            with open(os.path.join(directory, f'{module}.py'), 'rb') as file:
+                digest.update(file.read())
+        _compiler_version = digest.hexdigest()
+    return _compiler_version
+
+
+class ProgramCache:
+    def __init__(self, directory=None, max_bytes=64 * 1024 * 1024):
+        self.directory = directory or os.path.join(os.path.expanduser('~'), '.cache', 'kublang')
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def get_path(self, code):
+        key = hashlib.sha256(compiler_version().encode() + code.encode()).hexdigest()
+        return os.path.join(self.directory, f'{key}.kubp')
+
+    def load(self, code):
+        path = self.get_path(code)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+            header, payload = data[:len(MAGIC) + _digest_size], data[len(MAGIC) + _digest_size:]
+            if header != MAGIC + hashlib.sha256(payload).digest():
+                raise ValueError(f"'{path}' is not a cached kublang program")
+            entry = pickle.loads(payload)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # anything that fails to unpickle is as good as missing
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # another process evicted it after it was read
+            pass
+        self.hits += 1
+        return entry
+
+    def store(self, code, entry):
+        os.makedirs(self.directory, exist_ok=True)
+        payload = pickle.dumps(entry, pickle.HIGHEST_PROTOCOL)
+        data = MAGIC + hashlib.sha256(payload).digest() + payload
+        if len(data) > self.max_bytes:
+            return
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(data)
+        os.replace(temporary, self.get_path(code))
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.kubp'):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith('.kubp'):
+                    self._remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,402 @@
+import ast
+import helpers
+import memo
+import names
+import resolve
+
+_compilers = {}
+_jumps = (ast.ReturnStatement, ast.Break, ast.Continue)
+
+
+def compiles(node_class):
+    def register(function):
+        _compilers[node_class] = function
+        return function
+    return register
+
+
+def compile_node(node):
+    for node_class in type(node).__mro__:
+        if node_class in _compilers:
+            return _compilers[node_class](node)
+    raise TypeError(f"Node {node.get_symbol()} cannot be compiled")
+
+
+def compile_program(root):
+    helpers.check_jumps(root)
+    return compile_node(resolve.resolve(root))
+
+
+def execute(root, name_table):
+    compile_program(root)(name_table)
+
+
+def _constant(node):
+    value = node.value
+
+    def run(frame):
+        return value
+    return run
+
+
+compiles(ast.Number)(_constant)
+compiles(ast.TrueOrFalse)(_constant)
+compiles(ast.GenericExpression)(_constant)
+
+
+@compiles(ast.String)
+def _string(node):
+    text = node.text
+
+    def run(frame):
+        return text
+    return run
+
+
+@compiles(ast.Program)
+def _program(node):
+    program, size = compile_node(node.program), node.scope_size
+
+    def run(name_table):
+        frame = names.Frame([None] * size, [None] * size, name_table.functions, name_table.output)
+        try:
+            program(frame)
+        finally:
+            frame.output.flush()
+    return run
+
+
+def _discard_result(line):
+    def run(frame):
+        line(frame)
+    return run
+
+
+@compiles(ast.Lines)
+def _lines(node):
+    statements = []
+    for line in node.lines:
+        statements.append(line)
+        if isinstance(line, _jumps):
+            break
+    if not any(helpers.can_exit(line) for line in statements[:-1]):
+        lines = [compile_node(line) for line in statements]
+        if statements and helpers.can_exit(statements[-1]):
+            *body, last = lines
+
+            def run(frame):
+                for line in body:
+                    line(frame)
+                return last(frame)
+            return run
+
+        def run(frame):
+            for line in lines:
+                line(frame)
+        return run
+    # only statements that may end the block hand back a result, so the values of calls are dropped
+    lines = [_discard_result(compile_node(line)) if isinstance(line, ast.FunctionCall) else compile_node(line)
+             for line in statements]
+
+    def run(frame):
+        for line in lines:
+            signal = line(frame)
+            if signal is not None:
+                return signal
+    return run
+
+
+@compiles(ast.BinaryMathOperator)
+def _binary_math_operator(node):
+    left, right, apply = compile_node(node.left), compile_node(node.right), helpers.math_operation(node.operation)
+
+    def run(frame):
+        return apply(left(frame), right(frame))
+    return run
+
+
+@compiles(ast.UnaryMathOperator)
+def _unary_math_operator(node):
+    operand = compile_node(node.operand)
+    negate = node.operator == '-'
+
+    def run(frame):
+        o = operand(frame)
+        helpers.check_numeric_type(o)
+        if negate:
+            return -o
+    return run
+
+
+@compiles(ast.BinaryLogicalOperator)
+def _binary_logical_operator(node):
+    left, right = compile_node(node.left), compile_node(node.right)
+    if node.operation == '&&':
+        def run(frame):
+            l, r = left(frame), right(frame)
+            if l.__class__ is not bool or r.__class__ is not bool:
+                helpers.check_boolean_type(l, r)
+            return l and r
+    elif node.operation == '||':
+        def run(frame):
+            l, r = left(frame), right(frame)
+            if l.__class__ is not bool or r.__class__ is not bool:
+                helpers.check_boolean_type(l, r)
+            return l or r
+    return run
+
+
+@compiles(ast.UnaryLogicalOperator)
+def _unary_logical_operator(node):
+    operand = compile_node(node.operand)
+    negate = node.operator == '!'
+
+    def run(frame):
+        o = operand(frame)
+        helpers.check_boolean_type(o)
+        if negate:
+            return not o
+    return run
+
+
+@compiles(ast.Comparison)
+def _comparison(node):
+    left, right, apply = compile_node(node.left), compile_node(node.right), helpers.comparison_operation(node.operation)
+
+    def run(frame):
+        return apply(left(frame), right(frame))
+    return run
+
+
+def _declare(node):
+    type_name, var_name = node.type_name.evaluate(None), node.var_name.evaluate(None)
+    if type_name == 'void':
+        def run(frame):
+            raise ValueError("Variables cannot be of type void")
+        return run
+    our_type, addresses, address = helpers.to_python_type(type_name), node.addresses, node.address
+
+    def run(frame):
+        frame.declare_slot(addresses, address, var_name, our_type)
+    return run
+
+
+compiles(ast.Declaration)(_declare)
+
+
+@compiles(ast.Assignment)
+def _assignment(node):
+    var_name, value, addresses = node.var_name.evaluate(None), compile_node(node.value), node.addresses
+    if len(addresses) == 1:
+        (depth, slot), = addresses
+
+        def run(frame):
+            v = value(frame)
+            if v.__class__ is frame.types[depth][slot]:
+                frame.values[depth][slot] = v
+            else:
+                frame.assign_slot(addresses, var_name, v)
+        return run
+
+    def run(frame):
+        frame.assign_slot(addresses, var_name, value(frame))
+    return run
+
+
+@compiles(ast.DeclarationWithAssignment)
+def _declaration_with_assignment(node):
+    declare, assign = _declare(node), _assignment(node)
+
+    def run(frame):
+        declare(frame)
+        assign(frame)
+    return run
+
+
+@compiles(ast.FunctionDeclaration)
+def _function_declaration(node):
+    fun_name = node.function_name.evaluate(None)
+    arguments = [(helpers.to_python_type(argument[0]), argument[1]) for argument in node.arguments.evaluate(None)]
+    body, size = compile_node(node.body), node.scope_size
+    argument_types = [argument[0] for argument in arguments]
+    return_type = helpers.to_python_type(node.return_type.evaluate(None))
+
+    def call(values, caller):
+        locals_count = size - len(values)
+        result = body(names.Frame(values + [None] * locals_count, argument_types + [None] * locals_count,
+                                  caller.functions, caller.output))
+        return None if result is ast.VOID else result
+
+    if not node.pure:
+        def run(frame):
+            frame.declare_function(fun_name=fun_name, arguments=arguments, body=call, return_type=return_type)
+        return run
+
+    def run(frame):
+        cache = memo.FunctionCache(fun_name)
+
+        def cached_call(values, caller):
+            return cache.call(values, call, values, caller)
+        frame.declare_function(fun_name=fun_name, arguments=arguments, body=cached_call, return_type=return_type,
+                               cache=cache)
+    return run
+
+
+@compiles(ast.ReturnStatement)
+def _return_statement(node):
+    expression = compile_node(node.expression)
+    if not isinstance(node.expression, ast.FunctionCall):
+        return expression
+
+    def run(frame):
+        value = expression(frame)
+        return ast.VOID if value is None else value
+    return run
+
+
+@compiles(ast.Break)
+def _break(node):
+    def run(frame):
+        return ast.BREAK
+    return run
+
+
+@compiles(ast.Continue)
+def _continue(node):
+    def run(frame):
+        return ast.CONTINUE
+    return run
+
+
+@compiles(ast.FunctionCall)
+def _function_call(node):
+    fun_name = node.name.evaluate(None)
+    arguments = [compile_node(argument) for argument in node.arguments.arguments]
+
+    def run(frame):
+        function_spec = frame.get_function(fun_name)
+        values = [argument(frame) for argument in arguments]
+        if (required := len(function_spec['arguments'])) != (provided := len(values)):
+            raise ValueError(f"Function '{node.name}' requires {required} arguments but got {provided}")
+        for index, ((expected_type, arg_name), value) in enumerate(zip(function_spec['arguments'], values)):
+            if expected_type != (actual_type := type(value)):
+                raise TypeError(f"Type mismatch in argument number {index}: expected {expected_type}, got {actual_type}")
+        function_return = function_spec['body'](values, frame)
+        if not isinstance(function_return, function_spec['return_type']):
+            raise TypeError(f"Value returned from function is of type {type(function_return)} but expected {function_spec['return_type']}")
+        return function_return
+    return run
+
+
+@compiles(ast.VariableRead)
+def _variable_read(node):
+    name, addresses = node.name, node.addresses
+    if len(addresses) == 1:
+        (depth, slot), = addresses
+
+        def run(frame):
+            value = frame.values[depth][slot]
+            if value is None:
+                return frame.get_slot(addresses, name)
+            return value
+        return run
+
+    def run(frame):
+        return frame.get_slot(addresses, name)
+    return run
+
+
+@compiles(ast.IfStatement)
+def _if_statement(node):
+    condition, statement, size = compile_node(node.condition), compile_node(node.statement), node.scope_size
+
+    def run(frame):
+        c = condition(frame)
+        if c.__class__ is not bool:
+            helpers.check_boolean_type(c)
+        if c:
+            signal = statement(frame.add_scope(size))
+            frame.remove_scope()
+            return signal
+    return run
+
+
+@compiles(ast.IfElseStatement)
+def _if_else_statement(node):
+    condition = compile_node(node.condition)
+    on_true, on_false = compile_node(node.on_true_statement), compile_node(node.on_false_statement)
+    size = node.scope_size
+
+    def run(frame):
+        c = condition(frame)
+        if c.__class__ is not bool:
+            helpers.check_boolean_type(c)
+        frame.add_scope(size)
+        if c:
+            signal = on_true(frame)
+        else:
+            signal = on_false(frame)
+        frame.remove_scope()
+        return signal
+    return run
+
+
+@compiles(ast.WhileStatement)
+def _while_statement(node):
+    statement, size = compile_node(node.statement), node.scope_size
+    condition = compile_node(node.condition)
+
+    if not any(helpers.can_exit(line) for line in node.statement.lines):
+        def run(frame):
+            c = condition(frame)
+            helpers.check_boolean_type(c)
+            while c:
+                statement(frame.add_scope(size))
+                frame.remove_scope()
+                c = condition(frame)
+        return run
+
+    def run(frame):
+        c = condition(frame)
+        helpers.check_boolean_type(c)
+        while c:
+            signal = statement(frame.add_scope(size))
+            frame.remove_scope()
+            if signal is not None:
+                if signal is ast.BREAK:
+                    break
+                if signal is not ast.CONTINUE:
+                    return signal
+            c = condition(frame)
+    return run
+
+
+@compiles(ast.Print)
+def _print(node):
+    expression = compile_node(node.expression)
+
+    def run(frame):
+        frame.output.print(expression(frame))
+    return run
+
+
+@compiles(ast.IntToFloat)
+def _int_to_float(node):
+    number = compile_node(node.number)
+
+    def run(frame):
+        n = number(frame)
+        helpers.check_int_type(n)
+        return float(n)
+    return run
+
+
+@compiles(ast.FloatToInt)
+def _float_to_int(node):
+    number = compile_node(node.number)
+
+    def run(frame):
+        n = number(frame)
+        helpers.check_float_type(n)
+        return int(n)
+    return run
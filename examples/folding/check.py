@@ -0,0 +1,45 @@
+import contextlib
+import glob
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import names
+import optimize
+import parse
+import typecheck
+from main import engines
+
+
+def run(code, engine, fold):
+    root = parse.parse(code)
+    if fold:
+        root = optimize.fold_constants(root)
+    root = typecheck.specialize(root)
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            engines[engine](root, names.NameTable())
+    except Exception as e:
+        output.write(f'{type(e).__name__}: {e}\n')
+    return output.getvalue()
+
+
+def main():
+    failures = 0
+    for filename in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.orl'))):
+        with open(filename, 'r') as file:
+            code = file.read()
+        for engine in engines:
+            unfolded, folded = run(code, engine, False), run(code, engine, True)
+            if unfolded != folded:
+                failures += 1
+                print(f'{os.path.basename(filename)} [{engine}] differs:\n--- unfolded\n{unfolded}--- folded\n{folded}')
+    print(f'{failures} mismatches')
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if main() else 0)
@@ -0,0 +1,30 @@
+import glob
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main import engines, run_file
+
+
+def main():
+    # programs named error_* must be rejected for a function that can end without returning; the others must run
+    # under --strict and print the same on every engine
+    failures = 0
+    for filename in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.orl'))):
+        name = os.path.basename(filename)
+        results = {engine: run_file(filename, engine, strict=True) for engine in engines}
+        for engine, result in results.items():
+            if name.startswith('error_'):
+                if result['ok'] or not any('without returning' in error for error in result['type_errors']):
+                    failures += 1
+                    print(f'{name} [{engine}] was not rejected: {result["type_errors"]}')
+            elif not result['ok'] or result['output'] != results['tree']['output']:
+                failures += 1
+                print(f'{name} [{engine}] failed: {result["error"]}\n{result["output"]}')
+    print(f'{failures} failures')
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if main() else 0)
@@ -1,5 +1,26 @@
+import functools
+import operator
+
 import ast
 
+math_operators = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '^': operator.pow,
+    '%': operator.mod,
+}
+
+comparison_operators = {
+    '=': operator.eq,
+    '≠': operator.ne,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+}
+
 
 def to_python_type(lang_type):
     if lang_type == 'int':
@@ -16,8 +37,10 @@ def to_python_type(lang_type):
 
 
 def check_type_match(*values):
-    if len(list(dict.fromkeys([type(val) for val in values]))) != 1:
-        raise TypeError(f"Operands are not of the same type")
+    first = type(values[0])
+    for value in values:
+        if type(value) is not first:
+            raise TypeError(f"Operands are not of the same type")
     return values[0]
 
 
@@ -53,10 +76,42 @@ def check_float_type(*values):
 
 
 def check_numeric_or_string_type(*values):
-    try:
-        check_numeric_type(*values)
-    except TypeError:
-        check_string_type(*values)
+    for value in values:
+        if type(value) is not int and type(value) is not float:
+            check_string_type(*values)
+            return
+
+
+def math_operation(operation):
+    op = math_operators[operation]
+    if operation == '+':
+        def apply(l, r):
+            t = type(l)
+            if t is type(r) and (t is int or t is float or t is str):
+                return op(l, r)
+            check_type_match(l, r)
+            check_numeric_or_string_type(l, r)
+    else:
+        def apply(l, r):
+            t = type(l)
+            if t is type(r) and (t is int or t is float):
+                return op(l, r)
+            check_type_match(l, r)
+            check_numeric_or_string_type(l, r)
+            check_numeric_type(l, r)
+    return apply
+
+
+def comparison_operation(operation):
+    op = comparison_operators[operation]
+
+    def apply(l, r):
+        t = type(l)
+        if t is type(r) and (t is int or t is float):
+            return op(l, r)
+        check_type_match(l, r)
+        check_numeric_type(l, r)
+    return apply
 
 
 def get_accessed_variables(node):
@@ -85,3 +140,69 @@ def get_assigned_variables(node):
 
     traverse(node)
     return variables
+
+
+def get_declared_variables(node):
+    variables = set()
+
+    def traverse(n):
+        nonlocal variables
+        if isinstance(n, (ast.Declaration, ast.DeclarationWithAssignment)):
+            variables.add(n.var_name.name)
+        for child in n.get_children():
+            traverse(child)
+
+    traverse(node)
+    return variables
+
+
+def can_exit(node, in_loop=False):
+    # whether running a statement may end the block it is in before that block's last line
+    if isinstance(node, ast.ReturnStatement):
+        return True
+    if isinstance(node, (ast.Break, ast.Continue)):
+        return not in_loop
+    # jumps are statements, so only blocks are searched; expressions, however deeply nested, cannot hold one
+    if isinstance(node, ast.Lines):
+        for line in node.lines:
+            if can_exit(line, in_loop):
+                return True
+        return False
+    if isinstance(node, ast.IfStatement):
+        return can_exit(node.statement, in_loop)
+    if isinstance(node, ast.IfElseStatement):
+        return can_exit(node.on_true_statement, in_loop) or can_exit(node.on_false_statement, in_loop)
+    if isinstance(node, ast.WhileStatement):
+        return can_exit(node.statement, True)
+    return False
+
+
+def check_jumps(node, in_loop=False):
+    # a break or continue must be inside a loop of its own function; the engines refuse to run one that is not
+    if isinstance(node, (ast.Break, ast.Continue)) and not in_loop:
+        raise TypeError(f"'{node.get_symbol().lower()}' outside of a loop")
+    if isinstance(node, ast.FunctionDeclaration):
+        in_loop = False
+    in_loop = in_loop or isinstance(node, ast.WhileStatement)
+    for child in node.get_children():
+        check_jumps(child, in_loop)
+
+
+def get_fields(node):
+    return _get_class_fields(type(node))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_class_fields(node_class):
+    return tuple(name for base in node_class.__mro__ for name in getattr(base, '__slots__', ()) if name != '__weakref__')
+
+
+def transform(node, function):
+    node = function(node)
+    for name in get_fields(node):
+        value = getattr(node, name, None)
+        if isinstance(value, ast.Node):
+            setattr(node, name, transform(value, function))
+        elif isinstance(value, list):
+            setattr(node, name, [transform(item, function) if isinstance(item, ast.Node) else item for item in value])
+    return node
@@ -0,0 +1,122 @@
+import copy
+
+import ast
+import helpers
+import names
+
+
+class Hooks:
+    # Subclass and override the callbacks you need; a program only reports to them when it is run through run(),
+    # which evaluates an instrumented copy of the tree, so uninstrumented runs never check for hooks.
+    def enter_node(self, node):
+        pass
+
+    def exit_node(self, node, value):
+        pass
+
+    def call_function(self, name, arguments):
+        pass
+
+    def return_function(self, name, value):
+        pass
+
+    def push_scope(self, name_table):
+        pass
+
+    def pop_scope(self, name_table):
+        pass
+
+    def write_variable(self, name, value):
+        pass
+
+
+class InstrumentedNameTable(names.NameTable):
+    hooks = None
+
+    def add_scope(self):
+        super().add_scope()
+        self.hooks.push_scope(self)
+        return self
+
+    def remove_scope(self):
+        self.hooks.pop_scope(self)
+        return super().remove_scope()
+
+    def assign_variable(self, var_name, value):
+        super().assign_variable(var_name, value)
+        self.hooks.write_variable(var_name, value)
+
+
+class FunctionBody(ast.Lines):
+    # The body of an instrumented function, reporting the call with its arguments and what it returned
+    __slots__ = ('function_name', 'hooks')
+
+    def __init__(self, lines, function_name, hooks):
+        super().__init__(lines.lines)
+        self.locate(lines)
+        self.function_name = function_name
+        self.hooks = hooks
+
+    def evaluate(self, name_table):
+        hooks = self.hooks
+        hooks.call_function(self.function_name, {name: variable['value'] for name, variable in name_table.variables[0].items()})
+        hooks.enter_node(self)
+        value = super().evaluate(name_table)
+        hooks.exit_node(self, value)
+        hooks.return_function(self.function_name, None if value is ast.VOID else value)
+        return value
+
+
+class Instrumentation:
+    def __init__(self, hooks):
+        self.hooks = hooks
+        self.variants = {}
+        self.name_table_class = type('NameTable', (InstrumentedNameTable,), {'hooks': hooks})
+
+    def variant(self, node_class):
+        # a subclass under the same name whose evaluate reports to the hooks; it adds no slots, so a copy of a
+        # node can take it as its class
+        if node_class not in self.variants:
+            hooks, evaluate = self.hooks, node_class.evaluate
+
+            def instrumented(node, name_table):
+                hooks.enter_node(node)
+                value = evaluate(node, name_table)
+                hooks.exit_node(node, value)
+                return value
+            self.variants[node_class] = type(node_class.__name__, (node_class,),
+                                             {'__slots__': (), 'evaluate': instrumented})
+        return self.variants[node_class]
+
+    def instrument(self, node):
+        if isinstance(node, ast.Leaf):
+            # leaves are interned per class, so instrumented ones are shared only by trees reporting to these hooks
+            return self.variant(type(node))(getattr(node, type(node).__slots__[0]))
+        duplicate = copy.copy(node)
+        duplicate.__class__ = self.variant(type(node))
+        for name in helpers.get_fields(duplicate):
+            value = getattr(duplicate, name, None)
+            if isinstance(value, ast.Node):
+                setattr(duplicate, name, self.instrument(value))
+            elif isinstance(value, list):
+                setattr(duplicate, name, [self.instrument(item) if isinstance(item, ast.Node) else item for item in value])
+        if isinstance(node, ast.FunctionDeclaration):
+            duplicate.body = FunctionBody(duplicate.body, node.function_name.name, self.hooks)
+        return duplicate
+
+    def name_table(self, name_table=None):
+        instrumented = self.name_table_class()
+        if name_table is not None:
+            instrumented.variables, instrumented.functions = name_table.variables, name_table.functions
+            instrumented.output = name_table.output
+        return instrumented
+
+
+def instrument(root, hooks):
+    return Instrumentation(hooks).instrument(root)
+
+
+def run(root, hooks, name_table=None):
+    # only the tree walker evaluates node by node, so it is the engine hooks are reported from
+    instrumentation = Instrumentation(hooks)
+    instrumentation.instrument(root).evaluate(instrumentation.name_table(name_table))
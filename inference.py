@@ -0,0 +1,290 @@
+from typing import NamedTuple, Optional
+
+import ast
+import helpers
+
+MAYBE = None
+
+_numeric = (int, float)
+
+
+class Variable(NamedTuple):
+    declared: Optional[bool]
+    assigned: Optional[bool]
+    var_type: Optional[type]
+    value_type: Optional[type]
+
+
+class FunctionSummary:
+    def __init__(self, declarations):
+        self.declarations = declarations
+        return_types = {helpers.to_python_type(declaration.return_type.name) for declaration in declarations}
+        self.return_type = return_types.pop() if len(return_types) == 1 else None
+        self.result_type = self.return_type
+
+    @property
+    def declaration(self):
+        return self.declarations[0] if len(self.declarations) == 1 else None
+
+
+def merge_variables(a, b):
+    if a is None or b is None:
+        known = a or b
+        return Variable(MAYBE, MAYBE, known.var_type, known.value_type)
+    if a.assigned is False:
+        value_type = b.value_type
+    elif b.assigned is False:
+        value_type = a.value_type
+    else:
+        value_type = a.value_type if a.value_type is b.value_type else None
+    return Variable(
+        True if a.declared and b.declared else MAYBE,
+        a.assigned if a.assigned is b.assigned else MAYBE,
+        a.var_type if a.var_type is b.var_type else None,
+        value_type,
+    )
+
+
+def math_result_type(operation, left, right):
+    if left is None or right is None or left is not right:
+        return None
+    if operation == '+' and left is str:
+        return str
+    if left not in _numeric:
+        return None
+    if operation == '/':
+        return float
+    return left
+
+
+def math_is_valid(operation, left, right):
+    if left is None or right is None:
+        return None
+    if left is not right:
+        return False
+    return left in _numeric or (operation == '+' and left is str)
+
+
+def comparison_is_valid(left, right):
+    if left is None or right is None:
+        return None
+    return left is right and left in _numeric
+
+
+def power_result_type(node, left, right):
+    if left is right is int and isinstance(node.right, ast.Number) and node.right.value >= 0:
+        return int
+    return None
+
+
+class Environment:
+    def __init__(self, variables=None):
+        self.variables = dict(variables or {})
+        self.scopes = [[]]
+        # False once every path here has left the block through a return, break or continue
+        self.reachable = True
+
+    def copy(self):
+        environment = Environment(self.variables)
+        environment.scopes = [list(scope) for scope in self.scopes]
+        environment.reachable = self.reachable
+        return environment
+
+    def merge(self, other):
+        if not other.reachable:
+            return
+        if not self.reachable:
+            self.variables, self.reachable = dict(other.variables), True
+            return
+        for name in set(self.variables) | set(other.variables):
+            self.variables[name] = merge_variables(self.variables.get(name), other.variables.get(name))
+
+    def add_scope(self):
+        self.scopes.append([])
+
+    def remove_scope(self):
+        for name in self.scopes.pop():
+            self.variables.pop(name, None)
+
+    def declare(self, name, var_type, is_global):
+        self.variables[name] = Variable(True, False, var_type, None)
+        self.scopes[0 if is_global else -1].append(name)
+
+    def assign(self, name, value_type):
+        variable = self.variables.get(name)
+        if variable is None:
+            return
+        if value_type is None and variable.var_type is not int:
+            value_type = variable.var_type
+        self.variables[name] = Variable(True, True, variable.var_type, value_type)
+
+    def read(self, name):
+        return self.variables.get(name)
+
+
+class Inference:
+    def __init__(self):
+        self.types = {}
+        self.reads = {}
+        self.declarations = {}
+        self.assignments = {}
+        self.functions = {}
+        self.returned = []
+        # for each loop being analyzed, the environments at its breaks and continues
+        self.loops = []
+
+    def type_of(self, node):
+        return self.types.get(id(node))
+
+    def analyze(self, root):
+        self._collect_functions(root)
+        for _ in range(len(self.functions) + 1):
+            result_types = {name: summary.result_type for name, summary in self.functions.items()}
+            for summary in self.functions.values():
+                for declaration in summary.declarations:
+                    self._analyze_function(declaration, summary)
+            if result_types == {name: summary.result_type for name, summary in self.functions.items()}:
+                break
+        self.lines(root.program, Environment())
+        return self
+
+    def _collect_functions(self, node):
+        if isinstance(node, ast.FunctionDeclaration):
+            name = node.function_name.name
+            declarations = self.functions[name].declarations if name in self.functions else []
+            self.functions[name] = FunctionSummary(declarations + [node])
+        for child in node.get_children():
+            self._collect_functions(child)
+
+    def _analyze_function(self, node, summary):
+        environment = Environment({
+            argument.arg_name.name: Variable(True, True, helpers.to_python_type(argument.type_name.name),
+                                             helpers.to_python_type(argument.type_name.name))
+            for argument in node.arguments.arguments
+        })
+        return_type = helpers.to_python_type(node.return_type.name)
+        self.returned, self.loops = [], []
+        self.lines(node.body, environment)
+        if environment.reachable:
+            self.returned.append(type(None))
+        if return_type is int and summary.result_type is int:
+            if any(value_type is None or value_type is bool for value_type in self.returned):
+                summary.result_type = None
+
+    def lines(self, node, environment):
+        for line in node.lines:
+            if isinstance(line, ast.ReturnStatement):
+                self.returned.append(self.expression(line.expression, environment))
+                environment.reachable = False
+                return
+            if isinstance(line, (ast.Break, ast.Continue)):
+                if self.loops:
+                    self.loops[-1][isinstance(line, ast.Continue)].append(environment.copy())
+                environment.reachable = False
+                return
+            self.statement(line, environment)
+
+    def block(self, node, environment):
+        environment.add_scope()
+        self.lines(node, environment)
+        environment.remove_scope()
+
+    def statement(self, node, environment):
+        if isinstance(node, (ast.Declaration, ast.DeclarationWithAssignment)):
+            name = node.var_name.name
+            self.declarations[id(node)] = environment.read(name)
+            if node.type_name.name != 'void':
+                environment.declare(name, helpers.to_python_type(node.type_name.name), node.is_global)
+        if isinstance(node, (ast.Assignment, ast.DeclarationWithAssignment)):
+            name = node.var_name.name
+            value_type = self.expression(node.value, environment)
+            self.assignments[id(node)] = environment.read(name)
+            environment.assign(name, value_type)
+        elif isinstance(node, (ast.FunctionCall, ast.Print)):
+            self.expression(node.expression if isinstance(node, ast.Print) else node, environment)
+        elif isinstance(node, ast.IfStatement):
+            self.expression(node.condition, environment)
+            on_true = environment.copy()
+            self.block(node.statement, on_true)
+            environment.merge(on_true)
+        elif isinstance(node, ast.IfElseStatement):
+            self.expression(node.condition, environment)
+            on_true, on_false = environment.copy(), environment.copy()
+            self.block(node.on_true_statement, on_true)
+            self.block(node.on_false_statement, on_false)
+            on_true.merge(on_false)
+            environment.variables, environment.reachable = on_true.variables, on_true.reachable
+        elif isinstance(node, ast.WhileStatement):
+            self.expression(node.condition, environment)
+            head = environment.copy()
+            while True:
+                body, exits = head.copy(), ([], [])
+                self.loops.append(exits)
+                self.block(node.statement, body)
+                self.loops.pop()
+                breaks, continues = (self.leave_scopes(exit, len(head.scopes)) for exit in exits)
+                for exit in continues:
+                    body.merge(exit)
+                body.merge(head)
+                if body.variables == head.variables:
+                    break
+                head = body
+            self.expression(node.condition, head)
+            for exit in breaks:
+                head.merge(exit)
+            environment.variables = head.variables
+
+    @staticmethod
+    def leave_scopes(environments, depth):
+        for environment in environments:
+            while len(environment.scopes) > depth:
+                environment.remove_scope()
+        return environments
+
+    def expression(self, node, environment):
+        # one frame per level of nesting, so long chains of operators analyze as deep as the tree walker runs them
+        if isinstance(node, (ast.Number, ast.TrueOrFalse, ast.GenericExpression)):
+            value_type = type(node.value)
+        elif isinstance(node, ast.String):
+            value_type = str
+        elif isinstance(node, ast.VariableRead):
+            variable = self.reads[id(node)] = environment.read(node.name)
+            if variable is None or not variable.declared or not variable.assigned:
+                value_type = None
+            else:
+                value_type = variable.value_type
+        elif isinstance(node, ast.BinaryMathOperator):
+            left, right = self.expression(node.left, environment), self.expression(node.right, environment)
+            if node.operation == '^':
+                value_type = power_result_type(node, left, right)
+            else:
+                value_type = math_result_type(node.operation, left, right)
+        elif isinstance(node, (ast.Comparison, ast.BinaryLogicalOperator)):
+            self.expression(node.left, environment)
+            self.expression(node.right, environment)
+            value_type = bool
+        elif isinstance(node, ast.UnaryMathOperator):
+            operand = self.expression(node.operand, environment)
+            value_type = operand if operand in _numeric else None
+        elif isinstance(node, ast.UnaryLogicalOperator):
+            self.expression(node.operand, environment)
+            value_type = bool
+        elif isinstance(node, ast.IntToFloat):
+            self.expression(node.number, environment)
+            value_type = float
+        elif isinstance(node, ast.FloatToInt):
+            self.expression(node.number, environment)
+            value_type = int
+        elif isinstance(node, ast.FunctionCall):
+            for argument in node.arguments.arguments:
+                self.expression(argument, environment)
+            summary = self.functions.get(node.name.name)
+            value_type = summary.result_type if summary is not None else None
+        else:
+            raise TypeError(f"Node {node.get_symbol()} cannot be analyzed")
+        self.types[id(node)] = value_type
+        return value_type
+
+
+def infer(root):
+    return Inference().analyze(root)
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+from typing import Any, NamedTuple
+
+import bytecode
+import closures
+import lex
+import main
+import names
+import parse
+import transpile
+import typecheck
+import vm
+
+# how each engine turns an optimized tree into what it runs, and how it runs that on a name table within a budget;
+# only the VM engines, whose code is metered, can keep to one
+_engines = {
+    'tree': (lambda root: root, lambda root, name_table, budget: root.evaluate(name_table)),
+    'closure': (closures.compile_program, lambda program, name_table, budget: program(name_table)),
+    'vm': (lambda root: bytecode.compile_program(root, metered=True), vm.run),
+    'python': (transpile.compile_program, lambda code, name_table, budget: transpile.run(code, name_table)),
+    # the VM with a YIELD at the top of every loop iteration and function body, which run_async pauses at
+    'async': (lambda root: bytecode.compile_program(root, yielding=True, metered=True), vm.run),
+}
+_budgeted = ('vm', 'async')
+# the closure and python engines resolve variables to slots of their own frames when they compile, so they neither
+# see the variables of a name table nor leave theirs in it
+_name_tables = ('tree', 'vm', 'async')
+
+# loop iterations and calls run between two returns to the event loop
+yield_interval = 1000
+
+
+def check_budget(program, budget):
+    if budget is not None and program.engine not in _budgeted:
+        raise ValueError(f"Only the {' and '.join(_budgeted)} engines run within a budget, not '{program.engine}'")
+
+
+def check_name_table(program, name_table):
+    if name_table is not None and program.engine not in _name_tables:
+        engines = ', '.join(_name_tables[:-1]) + f' and {_name_tables[-1]}'
+        raise ValueError(f"Only the {engines} engines run on a given name table, not '{program.engine}'")
+
+
+class CompiledProgram(NamedTuple):
+    # Runs only read what they are given here and keep their state in a name table or frame of their own, so one
+    # compiled program can be run by any number of threads at once
+    engine: str
+    executable: Any
+    errors: tuple
+    removed: tuple
+
+
+class Interpreter:
+    # Compiles and runs programs for embedding. Every thread gets a lexer and parser of its own, so one interpreter
+    # can serve a whole thread pool without locking.
+    def __init__(self, engine='tree', strict=False):
+        if engine not in _engines:
+            raise ValueError(f"Unknown engine '{engine}'")
+        self.engine = engine
+        self.strict = strict
+        self.local = threading.local()
+
+    def parse(self, code):
+        local = self.local
+        if not hasattr(local, 'parser'):
+            local.parser, local.lexer = parse.new_parser(), lex.new_lexer()
+        return parse.parse(code, local.parser, local.lexer)
+
+    def compile(self, code):
+        root, errors, removed = main.compile_tree(self.parse(code))
+        if self.strict and errors:
+            raise typecheck.TypeCheckError(errors)
+        return CompiledProgram(self.engine, _engines[self.engine][0](root), tuple(errors), tuple(removed))
+
+    def run(self, program, name_table=None, output=None, budget=None):
+        # returns the name table the program ran on; its variables are only kept there by the tree and VM engines
+        check_budget(program, budget)
+        check_name_table(program, name_table)
+        if name_table is None:
+            name_table = names.NameTable(output=output)
+        try:
+            _engines[program.engine][1](program.executable, name_table, budget)
+        finally:
+            name_table.output.flush()
+        return name_table
+
+    def execute(self, code, name_table=None, output=None, budget=None):
+        return self.run(self.compile(code), name_table, output, budget)
+
+    async def run_async(self, program, name_table=None, output=None, interval=None, timeout=None, budget=None):
+        # cancelling the task stops the program at its next pause; so does running longer than timeout seconds
+        if program.engine != 'async':
+            raise ValueError(f"Only programs compiled for the 'async' engine run as coroutines, not '{program.engine}'")
+        check_budget(program, budget)
+        if name_table is None:
+            name_table = names.NameTable(output=output)
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        steps = vm.run_steps(program.executable, name_table, yield_interval if interval is None else interval, budget)
+        try:
+            for _ in steps:
+                if deadline is not None and loop.time() >= deadline:
+                    raise TimeoutError(f'Program ran for longer than {timeout} seconds')
+                await asyncio.sleep(0)
+        finally:
+            steps.close()
+            name_table.output.flush()
+        return name_table
+
+    async def execute_async(self, code, name_table=None, output=None, interval=None, timeout=None, budget=None):
+        return await self.run_async(self.compile(code), name_table, output, interval, timeout, budget)
@@ -1,4 +1,7 @@
 
+import os
+import sys
+
 import ply.lex as lex
 
 reserved = {
@@ -14,6 +17,8 @@ reserved = {
     'void': 'VOID',
     'print': 'PRINT',
     'return': 'RETURN',
+    'break': 'BREAK',
+    'continue': 'CONTINUE',
     'inttofloat': 'TYPECONV',
     'floattoint': 'TYPECONV',
     'global': 'GLOBAL',
@@ -91,18 +96,39 @@ def t_NEWLINE(t):
 
 
 def t_error(t):
-    print("Illegal character '%s'" % t.value[0])
+    column = t.lexpos - t.lexer.lexdata.rfind('\n', 0, t.lexpos)
+    print("Illegal character '%s' at line %d, column %d" % (t.value[0], t.lexer.lineno, column))
     t.lexer.skip(1)
 
 
 t_ignore = " \t"
 
 
-lexer = lex.lex()
+_lexer = None
+
+
+def get_lexer():
+    global _lexer
+    if _lexer is None:
+        # reads the prebuilt lextab.py; run `python parse.py` to regenerate it after changing the tokens
+        _lexer = lex.lex(module=sys.modules[__name__], optimize=True, lextab='lextab',
+                         outputdir=os.path.dirname(os.path.abspath(__file__)))
+    # the lexer is reused, so line numbers start over for every input
+    _lexer.lineno = 1
+    return _lexer
+
+
+def new_lexer():
+    # a lexer of its own, so several threads can lex at once; the compiled rules are shared with the others
+    return get_lexer().clone()
+
+
+def write_table(outputdir):
+    lex.lex(module=sys.modules[__name__]).writetab('lextab', outputdir)
 
 
 def process_tokens(data):
-    global lexer
+    lexer = get_lexer()
     lexer.input(data)
     while True:
         tok = lexer.token()
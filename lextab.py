@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'ASSIGN', 'BOOLEAN', 'BREAK', 'COMMA', 'CONTINUE', 'DIV', 'ELSE', 'EQ', 'FALSE', 'FLOAT', 'GLOBAL', 'GT', 'GTE', 'IF', 'INT', 'LBRACE', 'LPAREN', 'LT', 'LTE', 'MINUS', 'MOD', 'NAME', 'NEQ', 'NEWLINE', 'NOT', 'NUMBER', 'OR', 'PLUS', 'POWER', 'PRINT', 'RBRACE', 'REAL', 'RETURN', 'RPAREN', 'STRING', 'TEXT', 'TIMES', 'TRUE', 'TYPECONV', 'UMINUS', 'VOID', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_OR>\\|\\|)|(?P<t_AND>&&)|(?P<t_REAL>(\\d+\\.\\d+)|(\\d+\\.)|(\\.\\d+))|(?P<t_NUMBER>\\d+)|(?P<t_TEXT>\\"(.*?)\\")|(?P<t_NAME>[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_NEWLINE>\\n+)|(?P<t_ASSIGN>:=)|(?P<t_COMMA>\\,)|(?P<t_GTE>>=)|(?P<t_LPAREN>\\()|(?P<t_LTE><=)|(?P<t_PLUS>\\+)|(?P<t_POWER>\\^)|(?P<t_RPAREN>\\))|(?P<t_TIMES>\\*)|(?P<t_DIV>/)|(?P<t_EQ>=)|(?P<t_GT>>)|(?P<t_LBRACE>{)|(?P<t_LT><)|(?P<t_MINUS>-)|(?P<t_MOD>%)|(?P<t_NEQ>≠)|(?P<t_NOT>!)|(?P<t_RBRACE>})', [None, ('t_OR', 'OR'), ('t_AND', 'AND'), ('t_REAL', 'REAL'), None, None, None, ('t_NUMBER', 'NUMBER'), ('t_TEXT', 'TEXT'), None, ('t_NAME', 'NAME'), ('t_NEWLINE', 'NEWLINE'), (None, 'ASSIGN'), (None, 'COMMA'), (None, 'GTE'), (None, 'LPAREN'), (None, 'LTE'), (None, 'PLUS'), (None, 'POWER'), (None, 'RPAREN'), (None, 'TIMES'), (None, 'DIV'), (None, 'EQ'), (None, 'GT'), (None, 'LBRACE'), (None, 'LT'), (None, 'MINUS'), (None, 'MOD'), (None, 'NEQ'), (None, 'NOT'), (None, 'RBRACE')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
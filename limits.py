@@ -0,0 +1,27 @@
+from typing import NamedTuple, Optional
+
+
+class BudgetExceeded(RuntimeError):
+    def __init__(self, resource, limit):
+        super().__init__(f"Program exceeded its {resource} budget of {limit}")
+        self.resource = resource
+        self.limit = limit
+
+
+class Budget(NamedTuple):
+    # What one run may use; None leaves a resource unlimited. Fuel counts VM instructions, charged a basic
+    # block at a time, so a run may stop up to a block before its fuel would actually run out.
+    fuel: Optional[int] = None
+    depth: Optional[int] = None
+    string_length: Optional[int] = None
+    scopes: Optional[int] = None
+
+
+def limit_string_length(operation, limit):
+    # the + of the VM, refusing strings longer than limit
+    def checked(left, right):
+        result = operation(left, right)
+        if result.__class__ is str and len(result) > limit:
+            raise BudgetExceeded('string_length', limit)
+        return result
+    return checked
@@ -1,36 +1,194 @@
+import argparse
+import concurrent.futures
+import glob
+import io
+import json
+import sys
+import time
+
+import cache
+import closures
 import helpers
+import inference
 import optimize
-from parse import parser
+import profiler
+import transpile
+import typecheck
+import vm
+import parse
 import lex
 import names
+import sinks
+import stream
+
+
+engines = {
+    'tree': lambda root, name_table: root.evaluate(name_table),
+    'closure': closures.execute,
+    'vm': vm.execute,
+    'python': transpile.execute,
+}
+
+
+def compile_program(code):
+    return compile_tree(parse.parse(code))
+
 
+def compile_tree(root):
+    root = optimize.fold_constants(root)
+    types, removed = inference.infer(root), []
+    # type errors are reported for the program as written, including code that is removed below
+    errors = typecheck.check(root, types)
+    root = optimize.fold_constants(optimize.inline_functions(root, types))
+    types = inference.infer(root)
+    root = optimize.eliminate_dead_code(root, types, removed)
+    root = optimize.hoist_loop_invariants(root, types)
+    root = optimize.eliminate_common_subexpressions(root)
+    root = optimize.mark_pure_functions(root)
+    return typecheck.specialize(root, inference.infer(root)), errors, removed
 
-def execute(code):
+
+def load_program(code, program_cache=None):
+    compiled = program_cache.load(code) if program_cache else None
+    if compiled is None:
+        compiled = compile_program(code)
+        if program_cache:
+            program_cache.store(code, compiled)
+    return compiled
+
+
+def execute(code, engine='tree', strict=False, program_cache=None, profile=False, folded_stacks=None, output=None,
+            show_tree=True):
     if len(code) > 1:
         # lex.process_tokens(code)
-        root = parser.parse(code)
-        optimize.simplify_while_statements(root)
-        print(root)
-        root.evaluate(names.NameTable())
+        root, errors, removed = load_program(code, program_cache)
+        if strict and errors:
+            raise typecheck.TypeCheckError(errors)
+        if show_tree:
+            print(root)
+            # diagnostics, kept out of the output of the program
+            for message in removed:
+                print(f'Removed {message}', file=sys.stderr)
+        if not profile:
+            engines[engine](root, names.NameTable(output=output))
+            return
+        if engine != 'tree':
+            raise ValueError(f"Only the tree engine can be profiled, not '{engine}'")
+        program_profile = profiler.profile(root, names.NameTable(output=output), code)
+        print(program_profile.report())
+        if folded_stacks:
+            program_profile.write_folded_stacks(folded_stacks)
 
 
-choice = 0
-while choice not in (1, 2):
-    print('Choose how you provide input: ')
-    print('[1] From console')
-    print('[2] From file')
+def run_file(filename, engine='tree', strict=False, cache_directory=None, show_tree=False):
+    # runs one program on a fresh name table and reports what happened instead of raising
+    result = {'file': filename, 'ok': False, 'output': '', 'error': None, 'type_errors': [], 'removed': [],
+              'compile_seconds': 0.0, 'run_seconds': 0.0}
+    output = io.StringIO()
     try:
-        choice = int(input('Choice: '))
-    except ValueError: print()
-
-if choice == 1:
-    while True:
-        program = ''
-        while line := input('>>> '):
-            program += line + '\n'
-        execute(program)
-else:
-    filename = input('Type filename (or leave blank to load examples/collatz.orl): ') or 'examples/collatz.orl'
-    with open(filename, 'r') as file:
-        program = file.read()
-    execute(program)
+        with open(filename, 'r') as file:
+            code = file.read()
+        start = time.perf_counter()
+        root, errors, removed = load_program(code, cache.ProgramCache(cache_directory) if cache_directory else None)
+        result['compile_seconds'] = time.perf_counter() - start
+        result['type_errors'], result['removed'] = errors, removed
+        if show_tree:
+            result['tree'] = str(root)
+        if strict and errors:
+            raise typecheck.TypeCheckError(errors)
+        start = time.perf_counter()
+        try:
+            engines[engine](root, names.NameTable(output=sinks.BufferedOutput(output)))
+        finally:
+            result['run_seconds'] = time.perf_counter() - start
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+    result['output'] = output.getvalue()
+    return result
+
+
+def run_files(filenames, engine='tree', strict=False, cache_directory=None, show_tree=False, jobs=None):
+    # programs are spread over a pool of worker processes, each run on a name table of its own; results come back
+    # in the order of filenames
+    arguments = (engine, strict, cache_directory, show_tree)
+    if jobs == 1:
+        return [run_file(filename, *arguments) for filename in filenames]
+    with concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+        futures = [pool.submit(run_file, filename, *arguments) for filename in filenames]
+        return [future.result() for future in futures]
+
+
+def expand_paths(patterns):
+    filenames = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            raise FileNotFoundError(f"No files match '{pattern}'")
+        filenames += matches
+    return filenames
+
+
+def interact():
+    choice = 0
+    while choice not in (1, 2):
+        print('Choose how you provide input: ')
+        print('[1] From console')
+        print('[2] From file')
+        try:
+            choice = int(input('Choice: '))
+        except ValueError: print()
+
+    if choice == 1:
+        # everything declared stays for the snippets that follow
+        session = stream.Session()
+        while True:
+            program = ''
+            try:
+                while line := input('>>> '):
+                    program += line + '\n'
+            except EOFError:
+                print()
+                break
+            try:
+                session.run(program)
+            except Exception as e:
+                print(f'{type(e).__name__}: {e}')
+    else:
+        filename = input('Type filename (or leave blank to load examples/collatz.orl): ') or 'examples/collatz.orl'
+        with open(filename, 'r') as file:
+            program = file.read()
+        execute(program, program_cache=cache.ProgramCache())
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Runs kublang programs; without files it asks for one interactively')
+    parser.add_argument('files', nargs='*', help='programs to run, or glob patterns matching them')
+    parser.add_argument('--engine', choices=engines, default='tree')
+    parser.add_argument('--strict', action='store_true', help='do not run programs with type errors')
+    parser.add_argument('--show-tree', action='store_true', help='add the syntax tree of every program to the summary')
+    parser.add_argument('--jobs', type=int, help='worker processes, one per CPU by default; 1 runs in this process')
+    parser.add_argument('--cache', metavar='DIRECTORY', help='reuse compiled programs stored in this directory')
+    parser.add_argument('--summary', metavar='FILE', help='write the JSON summary here instead of standard output')
+    args = parser.parse_args(arguments)
+    if not args.files:
+        interact()
+        return 0
+
+    filenames = expand_paths(args.files)
+    start = time.perf_counter()
+    results = run_files(filenames, args.engine, args.strict, args.cache, args.show_tree, args.jobs)
+    failed = sum(not result['ok'] for result in results)
+    summary = {'engine': args.engine, 'files': len(results), 'passed': len(results) - failed, 'failed': failed,
+               'seconds': time.perf_counter() - start, 'results': results}
+    if args.summary:
+        with open(args.summary, 'w') as file:
+            json.dump(summary, file, indent=2)
+    else:
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import collections
+
+max_entries = 1024
+
+MISSING = object()
+
+
+class FunctionCache:
+    # Results of a pure function keyed on its already type-checked arguments, least recently used evicted first
+    def __init__(self, name, max_size=None):
+        self.name = name
+        self.max_size = max_entries if max_size is None else max_size
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(values):
+        # -0.0 == 0.0 but they are different arguments, so floats are keyed by their exact bits
+        return tuple(value.hex() if value.__class__ is float else value for value in values)
+
+    def get(self, key):
+        entries = self.entries
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+            return entries[key]
+        self.misses += 1
+        return MISSING
+
+    def put(self, key, result):
+        entries = self.entries
+        entries[key] = result
+        if len(entries) > self.max_size:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def call(self, values, function, *arguments):
+        key = self.key(values)
+        result = self.get(key)
+        if result is MISSING:
+            result = function(*arguments)
+            self.put(key, result)
+        return result
+
+    def clear(self):
+        self.entries.clear()
+
+    def __repr__(self):
+        return f"FunctionCache('{self.name}', hits={self.hits}, misses={self.misses}, evictions={self.evictions}, " \
+               f"size={len(self.entries)}/{self.max_size})"
+
+
+def get_caches(functions):
+    return {name: spec['cache'] for name, spec in functions.items() if spec.get('cache') is not None}
@@ -1,10 +1,33 @@
 from typing import Any, Optional
 
+import sinks
 
-class NameTable:
-    def __init__(self, initial_variables: Optional[dict] = None, initial_functions: Optional[dict] = None):
+
+class FunctionTable:
+    functions: dict
+
+    def declare_function(self, fun_name, arguments, body, return_type, cache=None):
+        if fun_name in self.functions:
+            raise ValueError(f"Function '{fun_name}' was already declared")
+        self.functions[fun_name] = {
+            'arguments': arguments,
+            'body': body,
+            'return_type': return_type,
+            'cache': cache,
+        }
+
+    def get_function(self, fun_name):
+        if fun_name not in self.functions:
+            raise ValueError(f"Function '{fun_name}' has not been declared")
+        return self.functions[fun_name]
+
+
+class NameTable(FunctionTable):
+    def __init__(self, initial_variables: Optional[dict] = None, initial_functions: Optional[dict] = None,
+                 output=None):
         self.variables = [{}] if initial_variables is None else [initial_variables]
         self.functions = initial_functions or {}
+        self.output = sinks.BufferedOutput() if output is None else output
 
     def declare_variable(self, var_name: str, var_type: type, is_global: bool = False):
         if self._get_scope_with_variable(var_name):
@@ -29,20 +52,6 @@ class NameTable:
                     raise ValueError(f"Variable '{var_name}' referenced before assignment")
         raise KeyError(f"Variable '{var_name}' was not declared")
 
-    def declare_function(self, fun_name, arguments, body, return_type):
-        if fun_name in self.functions:
-            raise ValueError(f"Function '{fun_name}' was already declared")
-        self.functions[fun_name] = {
-            'arguments': arguments,
-            'body': body,
-            'return_type': return_type,
-        }
-
-    def get_function(self, fun_name):
-        if fun_name not in self.functions:
-            raise ValueError(f"Function '{fun_name}' has not been declared")
-        return self.functions[fun_name]
-
     def add_scope(self):
         self.variables.append({})
         return self
@@ -59,3 +68,46 @@ class NameTable:
 
     def _is_assigned(self, name: str, scope: dict):
         return name in scope and scope[name]['value'] is not None
+
+
+class Frame(FunctionTable):
+    def __init__(self, values: list, types: list, initial_functions: Optional[dict] = None, output=None):
+        self.values = [values]
+        self.types = [types]
+        self.functions = {} if initial_functions is None else initial_functions
+        self.output = sinks.BufferedOutput() if output is None else output
+
+    def declare_slot(self, addresses: tuple, address: tuple, var_name: str, var_type: type):
+        for depth, slot in addresses:
+            if self.types[depth][slot] is not None:
+                raise ValueError(f"Variable '{var_name}' was already declared")
+        depth, slot = address
+        self.types[depth][slot] = var_type
+        self.values[depth][slot] = None
+
+    def assign_slot(self, addresses: tuple, var_name: str, value: Any):
+        for depth, slot in addresses:
+            if (var_type := self.types[depth][slot]) is not None:
+                if isinstance(value, var_type):
+                    self.values[depth][slot] = value
+                    return
+                raise TypeError("Type mismatch between declared and assigned value")
+        raise KeyError(f"'{var_name}' was not declared")
+
+    def get_slot(self, addresses: tuple, var_name: str):
+        for depth, slot in addresses:
+            if self.types[depth][slot] is not None:
+                if (value := self.values[depth][slot]) is not None:
+                    return value
+                raise ValueError(f"Variable '{var_name}' referenced before assignment")
+        raise KeyError(f"Variable '{var_name}' was not declared")
+
+    def add_scope(self, size: int):
+        self.values.append([None] * size)
+        self.types.append([None] * size)
+        return self
+
+    def remove_scope(self):
+        self.values.pop()
+        self.types.pop()
+        return self
@@ -1,19 +1,696 @@
+import abc
+import copy
+import itertools
+import math
+from typing import Any, FrozenSet, NamedTuple
+
 import ast
 import helpers
+import inference
+
+
+_literals = (ast.Number, ast.String, ast.TrueOrFalse)
+_jump_keywords = {ast.ReturnStatement: 'return', ast.Break: 'break', ast.Continue: 'continue'}
+_jumps = tuple(_jump_keywords)
+
+# x + 0.0 is not x when x is -0.0, so float zeros are only dropped from x - 0.0
+_right_identities = {
+    '+': {(int, 0), (str, '')},
+    '-': {(int, 0), (float, 0.0)},
+    '*': {(int, 1), (float, 1.0)},
+    '/': {(float, 1.0)},
+    '^': {(int, 1), (float, 1.0)},
+}
+_left_identities = {
+    '+': {(int, 0), (str, '')},
+    '*': {(int, 1), (float, 1.0)},
+}
+_logical_identities = {'&&': True, '||': False}
+_unary_operand_types = {ast.UnaryMathOperator: (int, float), ast.UnaryLogicalOperator: (bool,)}
+
+_max_folded_bits = 4096
+_max_inlined_size = 16
+
+
+def get_literal(node):
+    if isinstance(node, ast.String):
+        return node.text
+    return node.value
+
+
+def make_literal(value):
+    if value.__class__ is bool:
+        return ast.TrueOrFalse(value)
+    if value.__class__ is str:
+        return ast.String(value)
+    return ast.Number(value)
+
+
+def _is_identity(node, identities, value_type):
+    if not isinstance(node, _literals):
+        return False
+    value = get_literal(node)
+    if value.__class__ is not value_type or (value_type, value) not in identities:
+        return False
+    return value_type is not float or math.copysign(1, value) > 0
+
+
+class ConstantFolder:
+    def __init__(self, types):
+        self.types = types
+
+    def type_of(self, node):
+        if isinstance(node, _literals):
+            return get_literal(node).__class__
+        return self.types.type_of(node)
+
+    def fold(self, node):
+        for name in helpers.get_fields(node):
+            value = getattr(node, name)
+            if isinstance(value, ast.Node):
+                setattr(node, name, self.fold(value))
+            elif isinstance(value, list):
+                setattr(node, name, [self.fold(item) if isinstance(item, ast.Node) else item for item in value])
+        if isinstance(node, (ast.BinaryMathOperator, ast.Comparison, ast.BinaryLogicalOperator)):
+            if isinstance(node.left, _literals) and isinstance(node.right, _literals):
+                return self.evaluate(node)
+            return self.simplify(node)
+        if isinstance(node, (ast.UnaryMathOperator, ast.UnaryLogicalOperator)):
+            if isinstance(node.operand, _literals):
+                return self.evaluate(node)
+            if type(node.operand) is type(node) and \
+                    self.type_of(node.operand.operand) in _unary_operand_types.get(type(node), ()):
+                return node.operand.operand
+        if isinstance(node, (ast.IntToFloat, ast.FloatToInt)) and isinstance(node.number, _literals):
+            return self.evaluate(node)
+        return node
+
+    def evaluate(self, node):
+        if isinstance(node, ast.BinaryMathOperator) and node.operation == '^':
+            base, exponent = get_literal(node.left), get_literal(node.right)
+            if base.__class__ is int and exponent.__class__ is int and abs(base).bit_length() * exponent > _max_folded_bits:
+                return node
+        try:
+            # the node checks its operands exactly like at runtime; anything that raises is left to raise there
+            return make_literal(node.evaluate(None))
+        except (TypeError, ValueError, ArithmeticError):
+            return node
+
+    def simplify(self, node):
+        left_type, right_type = self.type_of(node.left), self.type_of(node.right)
+        if left_type is None or left_type is not right_type:
+            return node
+        if isinstance(node, ast.BinaryLogicalOperator):
+            identity = _logical_identities[node.operation]
+            if left_type is bool and isinstance(node.right, ast.TrueOrFalse) and node.right.value is identity:
+                return node.left
+            if left_type is bool and isinstance(node.left, ast.TrueOrFalse) and node.left.value is identity:
+                return node.right
+        elif isinstance(node, ast.BinaryMathOperator):
+            if _is_identity(node.right, _right_identities.get(node.operation, ()), left_type):
+                return node.left
+            if _is_identity(node.left, _left_identities.get(node.operation, ()), left_type):
+                return node.right
+        return node
+
+
+def fold_constants(root, types=None):
+    return ConstantFolder(types or inference.infer(root)).fold(root)
+
+
+_type_names = {int: 'int', float: 'float', str: 'string', bool: 'boolean'}
+_hidden_names = itertools.count()
+
+_numeric = (int, float)
+_math_operand_types = {'+': (int, float, str), '-': _numeric, '*': _numeric, '/': (float,), '%': _numeric,
+                       '^': (int,)}
+# these divide or exponentiate, so they are only moved when the right operand is a literal that cannot raise
+_literal_right_operand = {'/': lambda value: value != 0, '%': lambda value: value != 0, '^': lambda value: value >= 0}
+
+
+def hidden_name(prefix):
+    # '$' cannot start an identifier in source code, so these never clash with user variables
+    return f'${prefix}{next(_hidden_names)}'
+
+
+def is_hidden(name):
+    return name.startswith('$')
+
+
+def _get_location(location):
+    parent, field, position = location
+    value = getattr(parent, field)
+    return value if position is None else value[position]
+
+
+def _set_location(location, node):
+    parent, field, position = location
+    if position is None:
+        setattr(parent, field, node)
+    else:
+        getattr(parent, field)[position] = node
+
+
+def _child_locations(node):
+    for field in helpers.get_fields(node):
+        value = getattr(node, field, None)
+        if isinstance(value, ast.Node):
+            yield node, field, None
+        elif isinstance(value, list):
+            for position, item in enumerate(value):
+                if isinstance(item, ast.Node):
+                    yield node, field, position
+
+
+class Expression(NamedTuple):
+    key: Any
+    names: FrozenSet[str]
+    size: int
+
+
+class ExpressionAnalysis:
+    # Finds the expressions that are pure and provably cannot raise, so they can be moved or dropped freely
+    def __init__(self, types):
+        self.types = types
+        self.hidden_types = {}
+        self.expressions = {}
+
+    def type_of(self, node):
+        if isinstance(node, _literals):
+            return get_literal(node).__class__
+        if isinstance(node, ast.VariableRead) and node.name in self.hidden_types:
+            return self.hidden_types[node.name]
+        return self.types.type_of(node)
+
+    def describe(self, node):
+        # None for anything impure or possibly raising, else a structural key, the names read and the node count
+        key = id(node)
+        if key in self.expressions:
+            return self.expressions[key]
+        expression = None
+        if isinstance(node, _literals):
+            expression = Expression(node, frozenset(), 1)
+        elif isinstance(node, ast.VariableRead):
+            if self.type_of(node) is not None:
+                expression = Expression(('read', node.name), frozenset((node.name,)), 1)
+        elif isinstance(node, (ast.BinaryMathOperator, ast.Comparison, ast.BinaryLogicalOperator)):
+            left, right = self.describe(node.left), self.describe(node.right)
+            if left is not None and right is not None and self._is_safe(node):
+                expression = Expression((type(node), node.operation, left.key, right.key), left.names | right.names,
+                                        left.size + right.size + 1)
+        elif isinstance(node, (ast.UnaryMathOperator, ast.UnaryLogicalOperator)):
+            operand = self.describe(node.operand)
+            if operand is not None and self.type_of(node.operand) in _unary_operand_types[type(node)]:
+                expression = Expression((type(node), node.operator, operand.key), operand.names, operand.size + 1)
+        self.expressions[key] = expression
+        return expression
+
+    def _is_safe(self, node):
+        left_type, right_type = self.type_of(node.left), self.type_of(node.right)
+        if left_type is None or left_type is not right_type:
+            return False
+        if isinstance(node, ast.BinaryLogicalOperator):
+            return left_type is bool
+        if isinstance(node, ast.Comparison):
+            return left_type in _numeric
+        if left_type not in _math_operand_types[node.operation]:
+            return False
+        if node.operation in _literal_right_operand:
+            return isinstance(node.right, _literals) and _literal_right_operand[node.operation](node.right.value)
+        return True
+
+
+class CodeMotion(ExpressionAnalysis, abc.ABC):
+    # Moves pure expressions into hidden variables. A moved expression may then run where the original never
+    # did (before a loop that runs zero times), which is why only expressions that cannot raise are moved.
+    def is_movable(self, node):
+        return not isinstance(node, (ast.VariableRead,) + _literals) and self.describe(node) is not None and \
+            self.type_of(node) in _type_names
+
+    def declare(self, prefix, node):
+        name, value_type = hidden_name(prefix), self.type_of(node)
+        self.hidden_types[name] = value_type
+        declaration = ast.DeclarationWithAssignment(ast.TypeName(_type_names[value_type]), ast.VariableName(name),
+                                                    node, False).locate(node)
+        return declaration, name
+
+    def visit(self, node):
+        if isinstance(node, ast.Lines):
+            self.lines(node)
+        else:
+            for child in node.get_children():
+                if isinstance(child, ast.Node):
+                    self.visit(child)
+
+    @abc.abstractmethod
+    def lines(self, node):
+        pass
+
+
+class LoopInvariantMotion(CodeMotion):
+    def lines(self, node):
+        lines = []
+        for line in node.lines:
+            if isinstance(line, ast.WhileStatement):
+                # outer loops go first, so whatever they leave behind is then hoisted out of the inner ones
+                lines += self.hoist(line)
+            lines.append(line)
+            self.visit(line)
+        node.lines = lines
+
+    def hoist(self, loop):
+        changed = helpers.get_assigned_variables(loop) | helpers.get_declared_variables(loop)
+        declarations, hoisted = [], {}
+        stack = list(_child_locations(loop))
+        while stack:
+            location = stack.pop()
+            node = _get_location(location)
+            if isinstance(node, ast.FunctionDeclaration):
+                continue
+            if self.is_movable(node) and not (expression := self.describe(node)).names & changed:
+                if expression.key not in hoisted:
+                    declaration, hoisted[expression.key] = self.declare('inv', node)
+                    declarations.append(declaration)
+                _set_location(location, ast.VariableRead(hoisted[expression.key]).locate(node))
+            else:
+                stack.extend(_child_locations(node))
+        # smaller values first, so a later common subexpression pass finds them whole before their uses
+        declarations.sort(key=lambda declaration: self.describe(declaration.value).size)
+        self.expressions.clear()
+        return declarations
+
+
+class CommonSubexpressions(CodeMotion):
+    def lines(self, node):
+        while self.eliminate(node):
+            pass
+        for line in node.lines:
+            self.visit(line)
+
+    @staticmethod
+    def get_sites(line):
+        # the expressions a statement evaluates exactly once; loops and nested blocks are left alone
+        if isinstance(line, ast.Print):
+            return [(line, 'expression', None)]
+        if isinstance(line, ast.ReturnStatement):
+            return [(line, 'expression', None)]
+        if isinstance(line, (ast.Assignment, ast.DeclarationWithAssignment)):
+            return [(line, 'value', None)]
+        if isinstance(line, (ast.IfStatement, ast.IfElseStatement)):
+            return [(line, 'condition', None)]
+        if isinstance(line, ast.FunctionCall):
+            return list(_child_locations(line.arguments))
+        return []
+
+    def collect(self, location, occurrences):
+        node = _get_location(location)
+        for child in _child_locations(node):
+            self.collect(child, occurrences)
+        if self.is_movable(node):
+            occurrences.append(location)
 
+    def eliminate(self, node):
+        windows, available = [], {}
+        for index, line in enumerate(node.lines):
+            occurrences = []
+            for site in self.get_sites(line):
+                self.collect(site, occurrences)
+            for location in occurrences:
+                expression = self.describe(_get_location(location))
+                available.setdefault(expression.key, (index, expression, []))[2].append(location)
+            changed = helpers.get_assigned_variables(line) | helpers.get_declared_variables(line)
+            for key in [key for key, (_, expression, _) in available.items() if expression.names & changed]:
+                windows.append(available.pop(key))
+            if isinstance(line, _jumps):
+                break
+        windows += available.values()
+        # replaced nodes are kept alive here so their ids cannot be reused while the pass runs
+        changed, declarations, replaced = False, {}, {}
+        for index, expression, locations in sorted(windows, key=lambda window: -window[1].size):
+            locations = [location for location in locations if id(_get_location(location)) not in replaced]
+            if len(locations) < 2:
+                continue
+            changed = True
+            parent, field, _ = locations[0]
+            if isinstance(parent, ast.DeclarationWithAssignment) and field == 'value' and \
+                    is_hidden(parent.var_name.name):
+                # hidden variables are never reassigned, so one that already holds the value is reused as is
+                name, locations = parent.var_name.name, locations[1:]
+            else:
+                declaration, name = self.declare('cse', _get_location(locations[0]))
+                declarations.setdefault(index, []).append(declaration)
+            for location in locations:
+                stack = [_get_location(location)]
+                while stack:
+                    replaced[id(stack[-1])] = stack[-1]
+                    stack.extend(stack.pop().get_children())
+                _set_location(location, ast.VariableRead(name).locate(_get_location(location)))
+        self.expressions.clear()
+        if declarations:
+            node.lines = [statement for index, line in enumerate(node.lines)
+                          for statement in declarations.get(index, []) + [line]]
+        return changed
 
-def simplify_while_statements(node):
-    if isinstance(node, ast.WhileStatement):
-        condition = node.condition
-        if isinstance(condition, ast.Comparison):
-            left_vars = helpers.get_accessed_variables(condition.left)
-            right_vars = helpers.get_accessed_variables(condition.right)
-            assigned_vars = helpers.get_assigned_variables(node.statement)
-            while_updates_left = bool(set(left_vars) & set(assigned_vars))
-            while_updates_right = bool(set(right_vars) & set(assigned_vars))
-            if not while_updates_left and not isinstance(condition.left, ast.VariableRead):
-                node.set_constant('left')
-            elif not while_updates_right and not isinstance(condition.right, ast.VariableRead):
-                node.set_constant('right')
+
+class DeadCodeEliminator(ExpressionAnalysis):
+    # Only drops what cannot be observed: branches and loops that never run, statements after a return, stores
+    # of values that cannot raise and are never read, and functions nobody calls.
+    def __init__(self, types):
+        super().__init__(types)
+        self.removed = []
+
+    def eliminate(self, root):
+        # removed statements never affected the program state, so the types inferred up front stay valid
+        while True:
+            removed = len(self.removed)
+            self.expressions.clear()
+            self.lines(root.program)
+            self.remove_uncalled_functions(root)
+            self.remove_unread_variables(root)
+            if len(self.removed) == removed:
+                return root
+
+    def report(self, node, reason):
+        if isinstance(node, (ast.Declaration, ast.DeclarationWithAssignment, ast.Assignment)):
+            self.removed.append(f"{node.get_symbol()} '{node.var_name.name}': {reason}")
+        elif isinstance(node, ast.FunctionDeclaration):
+            self.removed.append(f"{node.get_symbol()} '{node.function_name.name}': {reason}")
+        else:
+            self.removed.append(f'{node.get_symbol()}: {reason}')
+
+    def visit(self, node):
+        if isinstance(node, ast.Lines):
+            self.lines(node)
+        else:
+            for child in node.get_children():
+                if isinstance(child, ast.Node):
+                    self.visit(child)
+
+    def lines(self, node):
+        lines = []
+        for position, line in enumerate(node.lines):
+            line = self.statement(line)
+            if line is None:
+                continue
+            lines.append(line)
+            self.visit(line)
+            if isinstance(line, _jumps):
+                for unreachable in node.lines[position + 1:]:
+                    self.report(unreachable, f'unreachable after {_jump_keywords[type(line)]}')
+                break
+        node.lines = self.remove_overwritten_stores(lines)
+
+    def statement(self, line):
+        if isinstance(line, (ast.IfStatement, ast.WhileStatement)) and _is_false(line.condition):
+            self.report(line, 'condition is always false')
+            return None
+        if isinstance(line, ast.IfElseStatement) and isinstance(line.condition, ast.TrueOrFalse):
+            self.report(line, f"{'else' if line.condition.value else 'if'} branch never runs")
+            return ast.IfStatement(ast.TrueOrFalse(True),
+                                   line.on_true_statement if line.condition.value else line.on_false_statement).locate(line)
+        return line
+
+    def remove_overwritten_stores(self, lines):
+        # walks backwards remembering whether each name is next read or next overwritten at this level
+        kept, next_access = [], {}
+        for line in reversed(lines):
+            if helpers.can_exit(line):
+                # whatever follows the block may read the names, so nothing stored before here counts as overwritten
+                next_access.clear()
+            if isinstance(line, ast.Assignment):
+                name = line.var_name.name
+                if next_access.get(name) == 'write' and self.is_removable(line):
+                    self.report(line, 'value is overwritten before it is read')
+                    continue
+                next_access[name] = 'write'
+            for name in helpers.get_accessed_variables(line) | helpers.get_declared_variables(line):
+                next_access[name] = 'read'
+            kept.append(line)
+        kept.reverse()
+        return kept
+
+    def is_removable(self, line):
+        if isinstance(line, ast.Assignment):
+            variable = self.types.assignments.get(id(line))
+            if variable is None or variable.declared is not True or variable.var_type is None:
+                return False
+            var_type = variable.var_type
+        else:
+            # a declaration is only dropped if it could not have failed as a redeclaration
+            if line.type_name.name == 'void' or self.types.declarations.get(id(line), line) is not None:
+                return False
+            if isinstance(line, ast.Declaration):
+                return True
+            var_type = helpers.to_python_type(line.type_name.name)
+        value_type = self.type_of(line.value)
+        return self.describe(line.value) is not None and value_type is not None and issubclass(value_type, var_type)
+
+    def remove_unread_variables(self, root):
+        read, stores = helpers.get_accessed_variables(root), {}
+        for lines in _get_blocks(root):
+            for line in lines.lines:
+                if isinstance(line, (ast.Declaration, ast.DeclarationWithAssignment, ast.Assignment)) and \
+                        line.var_name.name not in read:
+                    stores.setdefault(line.var_name.name, []).append(line)
+        dead = {id(line): line for statements in stores.values() if all(map(self.is_removable, statements))
+                for line in statements}
+        self.remove(root, dead, 'variable is never read')
+
+    def remove_uncalled_functions(self, root):
+        declarations, calls = {}, {}
+
+        def collect(node, owner, once):
+            if isinstance(node, ast.FunctionDeclaration):
+                name = node.function_name.name
+                declarations.setdefault(name, []).append((node, once))
+                owner, once = name, False
+            elif isinstance(node, ast.FunctionCall):
+                calls.setdefault(owner, set()).add(node.name.name)
+            elif isinstance(node, ast.WhileStatement):
+                once = False
+            for child in node.get_children():
+                if isinstance(child, ast.Node):
+                    collect(child, owner, once)
+
+        collect(root, None, True)
+        called, pending = set(), [None]
+        while pending:
+            for name in calls.get(pending.pop(), ()):
+                if name not in called:
+                    called.add(name)
+                    pending.append(name)
+        # declaring a function twice raises, so only a single declaration that runs at most once is dropped
+        dead = {id(node): node for name, nodes in declarations.items() if name not in called and len(nodes) == 1
+                for node, once in nodes if once}
+        self.remove(root, dead, 'function is never called')
+
+    def remove(self, root, dead, reason):
+        if not dead:
+            return
+        for lines in _get_blocks(root):
+            kept = []
+            for line in lines.lines:
+                if id(line) in dead:
+                    self.report(line, reason)
+                else:
+                    kept.append(line)
+            lines.lines = kept
+
+
+class FunctionInliner(ExpressionAnalysis):
+    # Replaces calls to small functions whose body is a single return by that expression, with the parameters
+    # substituted. Calls are only inlined when the arguments are pure and already have the declared parameter
+    # types, so the call's own argument and return checks could never have failed.
+    def __init__(self, types, max_size):
+        super().__init__(types)
+        self.max_size = max_size
+        self.copies = {}
+        self.inlined = []
+
+    def type_of(self, node):
+        if id(node) in self.copies:
+            return self.copies[id(node)][1]
+        return super().type_of(node)
+
+    def inline(self, root):
+        recursive = _get_recursive_functions(root)
+        declared = {}
+        for declaration in _get_function_declarations(root):
+            declared[declaration.function_name.name] = declared.get(declaration.function_name.name, 0) + 1
+        # a top-level function is declared before every later top-level statement runs, function bodies included
+        visible = {}
+        for line in root.program.lines:
+            self.visit(line, visible)
+            if isinstance(line, ast.FunctionDeclaration):
+                name = line.function_name.name
+                if declared[name] == 1 and name not in recursive and self.is_inlinable(line):
+                    visible[name] = line
+        return root
+
+    def is_inlinable(self, declaration):
+        body, parameters = declaration.body.lines, [argument.arg_name.name for argument in
+                                                    declaration.arguments.arguments]
+        if not body or not isinstance(body[0], ast.ReturnStatement) or len(set(parameters)) != len(parameters):
+            return False
+        expression, return_type = body[0].expression, helpers.to_python_type(declaration.return_type.name)
+        value_type = self.type_of(expression)
+        return value_type is not None and return_type is not type(None) and issubclass(value_type, return_type) \
+            and helpers.get_accessed_variables(expression) <= set(parameters) and \
+            _get_size(expression) <= self.max_size
+
+    def visit(self, node, visible):
+        for location in _child_locations(node):
+            child = _get_location(location)
+            self.visit(child, visible)
+            # a call used as a statement has nothing to be replaced by
+            if isinstance(child, ast.FunctionCall) and not isinstance(node, ast.Lines):
+                replacement = self.inline_call(child, visible.get(child.name.name))
+                if replacement is not None:
+                    _set_location(location, replacement)
+
+    def inline_call(self, call, declaration):
+        if declaration is None or len(call.arguments.arguments) != len(declaration.arguments.arguments):
+            return None
+        expression = declaration.body.lines[0].expression
+        uses, size, substitutions = _count_reads(expression), _get_size(expression), {}
+        for parameter, argument in zip(declaration.arguments.arguments, call.arguments.arguments):
+            name = parameter.arg_name.name
+            if self.type_of(argument) is not helpers.to_python_type(parameter.type_name.name) or \
+                    self.describe(argument) is None:
+                return None
+            # an argument read several times is evaluated several times, which counts against the threshold
+            size += max(uses.get(name, 0) - 1, 0) * self.describe(argument).size
+            substitutions[name] = argument
+        if size > self.max_size:
+            return None
+        # the replaced call is kept alive so its id cannot be reused by a copy while types are looked up by id
+        self.inlined.append(call)
+        return self.copy(expression, substitutions)
+
+    def copy(self, node, substitutions):
+        if isinstance(node, ast.VariableRead) and node.name in substitutions:
+            return self.copy(substitutions[node.name], {})
+        if isinstance(node, ast.Leaf):
+            return node
+        duplicate = copy.copy(node)
+        for location in _child_locations(duplicate):
+            _set_location(location, self.copy(_get_location(location), substitutions))
+        self.copies[id(duplicate)] = (duplicate, self.type_of(node))
+        return duplicate
+
+
+def _get_size(node):
+    return 1 + sum(_get_size(child) for child in node.get_children() if isinstance(child, ast.Node))
+
+
+def _count_reads(node):
+    counts = {}
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.VariableRead):
+            counts[node.name] = counts.get(node.name, 0) + 1
+        stack.extend(child for child in node.get_children() if isinstance(child, ast.Node))
+    return counts
+
+
+def _get_function_declarations(node):
+    if isinstance(node, ast.FunctionDeclaration):
+        yield node
     for child in node.get_children():
-        simplify_while_statements(child)
+        if isinstance(child, ast.Node):
+            yield from _get_function_declarations(child)
+
+
+def _get_called_functions(node):
+    called = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.FunctionCall):
+            called.add(node.name.name)
+        stack.extend(child for child in node.get_children() if isinstance(child, ast.Node))
+    return called
+
+
+def _get_recursive_functions(root):
+    calls = {}
+    for declaration in _get_function_declarations(root):
+        calls.setdefault(declaration.function_name.name, set()).update(_get_called_functions(declaration.body))
+    recursive = set()
+    for name in calls:
+        seen, pending = set(), list(calls[name])
+        while pending:
+            callee = pending.pop()
+            if callee not in seen:
+                seen.add(callee)
+                pending.extend(calls.get(callee, ()))
+        if name in seen:
+            recursive.add(name)
+    return recursive
+
+
+def _has_side_effects(node):
+    # functions cannot see the caller's variables, so printing, global declarations and declaring functions into
+    # the shared function table are the only effects a call can have besides its result
+    if isinstance(node, (ast.Print, ast.FunctionDeclaration)):
+        return True
+    if isinstance(node, (ast.Declaration, ast.DeclarationWithAssignment)) and node.is_global:
+        return True
+    return any(_has_side_effects(child) for child in node.get_children() if isinstance(child, ast.Node))
+
+
+def _has_repeated_work(node):
+    if isinstance(node, (ast.FunctionCall, ast.WhileStatement)):
+        return True
+    return any(_has_repeated_work(child) for child in node.get_children() if isinstance(child, ast.Node))
+
+
+def _is_false(node):
+    return isinstance(node, ast.TrueOrFalse) and node.value is False
+
+
+def _get_blocks(node):
+    if isinstance(node, ast.Lines):
+        yield node
+    for child in node.get_children():
+        if isinstance(child, ast.Node):
+            yield from _get_blocks(child)
+
+
+def hoist_loop_invariants(root, types=None):
+    LoopInvariantMotion(types or inference.infer(root)).visit(root)
+    return root
+
+
+def eliminate_common_subexpressions(root, types=None):
+    CommonSubexpressions(types or inference.infer(root)).visit(root)
+    return root
+
+
+def eliminate_dead_code(root, types=None, removed=None):
+    eliminator = DeadCodeEliminator(types or inference.infer(root))
+    eliminator.eliminate(root)
+    if removed is not None:
+        removed += eliminator.removed
+    return root
+
+
+def mark_pure_functions(root):
+    declarations, calls = {}, {}
+    for declaration in _get_function_declarations(root):
+        name = declaration.function_name.name
+        declarations.setdefault(name, []).append(declaration)
+        calls.setdefault(name, set()).update(_get_called_functions(declaration.body))
+    pure = {name for name, nodes in declarations.items() if not any(_has_side_effects(node.body) for node in nodes)}
+    while impure := {name for name in pure if not calls[name] <= pure}:
+        pure -= impure
+    # a body without calls or loops is cheaper to run again than to look up
+    for name, nodes in declarations.items():
+        for node in nodes:
+            node.pure = name in pure and _has_repeated_work(node.body)
+    return root
+
+
+def inline_functions(root, types=None, max_size=_max_inlined_size):
+    return FunctionInliner(types or inference.infer(root), max_size).inline(root)
@@ -1,5 +1,10 @@
 
+import copy
+import os
+import sys
+
 import ply.yacc as yacc
+import lex
 from lex import tokens
 import ast
 
@@ -17,18 +22,37 @@ precedence = (
 )
 
 
+def _locate(p, node):
+    # with tracking on, a nonterminal has the line and offset of its first token
+    position = p.lexpos(1)
+    node.line, node.column = p.lineno(1), position - p.lexer.lexdata.rfind('\n', 0, position)
+    return node
+
+
 def p_input(p):
-    """program : statements"""
-    p[0] = ast.Program(p[1])
+    """program : top_statements"""
+    p[0] = _locate(p, ast.Program(p[1]))
+
+
+def p_top_lines(p):
+    """top_statements : top_statements statement
+                      | statement"""
+    lines = p[1] if len(p) == 3 else _locate(p, ast.Lines([]))
+    if p.parser.consume_statement:
+        p.parser.consume_statement(p[len(p) - 1])
+    else:
+        lines.lines.append(p[len(p) - 1])
+    p[0] = lines
 
 
 def p_lines(p):
     """statements : statements statement
                   | statement"""
     if len(p) == 3:
-        p[0] = ast.Lines(p[1].lines + [p[2]])
+        p[1].lines.append(p[2])
+        p[0] = p[1]
     else:
-        p[0] = ast.Lines([p[1]])
+        p[0] = _locate(p, ast.Lines([p[1]]))
 
 
 def p_parentheses(p):
@@ -40,23 +64,23 @@ def p_declaration(p):
     """statement : type NAME
                  | GLOBAL type NAME"""
     if len(p) == 3:
-        p[0] = ast.Declaration(p[1], ast.VariableName(p[2]), is_global=False)
+        p[0] = _locate(p, ast.Declaration(p[1], ast.VariableName(p[2]), is_global=False))
     else:
-        p[0] = ast.Declaration(p[2], ast.VariableName(p[3]), is_global=True)
+        p[0] = _locate(p, ast.Declaration(p[2], ast.VariableName(p[3]), is_global=True))
 
 
 def p_assignment(p):
     """statement : NAME ASSIGN expr"""
-    p[0] = ast.Assignment(ast.VariableName(p[1]), p[3])
+    p[0] = _locate(p, ast.Assignment(ast.VariableName(p[1]), p[3]))
 
 
 def p_assignment_and_declaration(p):
     """statement : type NAME ASSIGN expr
                  | GLOBAL type NAME ASSIGN expr"""
     if len(p) == 5:
-        p[0] = ast.DeclarationWithAssignment(p[1], ast.VariableName(p[2]), p[4], is_global=False)
+        p[0] = _locate(p, ast.DeclarationWithAssignment(p[1], ast.VariableName(p[2]), p[4], is_global=False))
     else:
-        p[0] = ast.DeclarationWithAssignment(p[2], ast.VariableName(p[3]), p[5], is_global=True)
+        p[0] = _locate(p, ast.DeclarationWithAssignment(p[2], ast.VariableName(p[3]), p[5], is_global=True))
 
 
 def p_binary_math_operator(p):
@@ -66,59 +90,23 @@ def p_binary_math_operator(p):
             | expr DIV expr
             | expr POWER expr
             | expr MOD expr"""
-    optimized = False
-    if p[2] == '/':
-        optimized = True
-        if isinstance(p[3], ast.Number) and p[3].value == 1:
-            p[0] = p[1]
-        else:
-            optimized = False
-    elif p[2] == '*':
-        optimized = True
-        if isinstance(p[3], ast.Number):
-            if p[3].value == 1:
-                p[0] = p[1]
-            elif p[3].value == 2:
-                p[0] = ast.BinaryMathOperator('+', p[1], p[1])
-        elif isinstance(p[1], ast.Number):
-            if p[1].value == 1:
-                p[0] = p[3]
-            elif p[1].value == 2:
-                p[0] = ast.BinaryMathOperator('+', p[3], p[3])
-        else:
-            optimized = False
-    elif p[2] == '+':
-        optimized = True
-        if isinstance(p[3], ast.Number) and p[3].value == 0:
-            p[0] = p[1]
-        elif isinstance(p[1], ast.Number) and p[1].value == 0:
-            p[0] = p[3]
-        else:
-            optimized = False
-    elif p[2] == '-' and isinstance(p[3], ast.Number) and p[3].value == 0:
-        p[0] = p[1]
-        optimized = True
-    elif p[2] == '^' and isinstance(p[3], ast.Number) and p[3].value == 2:
-        p[0] = ast.BinaryMathOperator('*', p[1], p[1])
-        optimized = True
-    if not optimized:
-        p[0] = ast.BinaryMathOperator(p[2], p[1], p[3])
+    p[0] = _locate(p, ast.BinaryMathOperator(p[2], p[1], p[3]))
 
 
 def p_unary_math_operator(p):
     """expr : MINUS expr %prec UMINUS"""
-    p[0] = ast.UnaryMathOperator(p[1], p[2])
+    p[0] = _locate(p, ast.UnaryMathOperator(p[1], p[2]))
 
 
 def p_binary_logical_operator(p):
     """expr : expr AND expr
             | expr OR expr"""
-    p[0] = ast.BinaryLogicalOperator(p[2], p[1], p[3])
+    p[0] = _locate(p, ast.BinaryLogicalOperator(p[2], p[1], p[3]))
 
 
 def p_unary_logical_operator(p):
     """expr : NOT expr"""
-    p[0] = ast.UnaryLogicalOperator(p[1], p[2])
+    p[0] = _locate(p, ast.UnaryLogicalOperator(p[1], p[2]))
 
 
 def p_comparison(p):
@@ -128,54 +116,55 @@ def p_comparison(p):
             | expr GTE expr
             | expr LT expr
             | expr LTE expr"""
-    p[0] = ast.Comparison(p[2], p[1], p[3])
+    p[0] = _locate(p, ast.Comparison(p[2], p[1], p[3]))
 
 
 def p_if(p):
     """statement : IF LPAREN expr RPAREN LBRACE statements RBRACE"""
-    p[0] = ast.IfStatement(p[3], p[6])
+    p[0] = _locate(p, ast.IfStatement(p[3], p[6]))
 
 
 def p_if_else(p):
     """statement : IF LPAREN expr RPAREN LBRACE statements RBRACE ELSE LBRACE statements RBRACE"""
-    p[0] = ast.IfElseStatement(p[3], p[6], p[10])
+    p[0] = _locate(p, ast.IfElseStatement(p[3], p[6], p[10]))
 
 
 def p_while(p):
     """statement : WHILE LPAREN expr RPAREN LBRACE statements RBRACE"""
-    p[0] = ast.WhileStatement(p[3], p[6])
+    p[0] = _locate(p, ast.WhileStatement(p[3], p[6]))
 
 
 def p_type_conversion(p):
     """expr : TYPECONV LPAREN expr RPAREN"""
     if p[1] == 'inttofloat':
-        p[0] = ast.IntToFloat(p[3])
+        p[0] = _locate(p, ast.IntToFloat(p[3]))
     elif p[1] == 'floattoint':
-        p[0] = ast.FloatToInt(p[3])
+        p[0] = _locate(p, ast.FloatToInt(p[3]))
 
 
 def p_function_declaration(p):
     """statement : type NAME LPAREN arglist RPAREN LBRACE statements RBRACE"""
-    p[0] = ast.FunctionDeclaration(ast.VariableName(p[2]), p[4], p[7], p[1])
+    p[0] = _locate(p, ast.FunctionDeclaration(ast.VariableName(p[2]), p[4], p[7], p[1]))
 
 
 def p_function_call(p):
     """statement : NAME LPAREN exprlist RPAREN"""
-    p[0] = ast.FunctionCall(ast.VariableName(p[1]), p[3])
+    p[0] = _locate(p, ast.FunctionCall(ast.VariableName(p[1]), p[3]))
 
 
 def p_function_call_expr(p):
     """expr : NAME LPAREN exprlist RPAREN"""
-    p[0] = ast.FunctionCall(ast.VariableName(p[1]), p[3])
+    p[0] = _locate(p, ast.FunctionCall(ast.VariableName(p[1]), p[3]))
 
 
 def p_expression_list(p):
     """exprlist : exprlist COMMA expr
                 | expr"""
     if len(p) == 4:
-        p[0] = ast.FunctionCallArguments(p[1].arguments + [p[3]])
+        p[1].arguments.append(p[3])
+        p[0] = p[1]
     else:
-        p[0] = ast.FunctionCallArguments([p[1]])
+        p[0] = _locate(p, ast.FunctionCallArguments([p[1]]))
 
 
 def p_expression_list_empty(p):
@@ -185,16 +174,27 @@ def p_expression_list_empty(p):
 
 def p_return(p):
     """statement : RETURN expr"""
-    p[0] = ast.ReturnStatement(p[2])
+    p[0] = _locate(p, ast.ReturnStatement(p[2]))
+
+
+def p_break(p):
+    """statement : BREAK"""
+    p[0] = _locate(p, ast.Break())
+
+
+def p_continue(p):
+    """statement : CONTINUE"""
+    p[0] = _locate(p, ast.Continue())
 
 
 def p_argument_list(p):
     """arglist : arglist COMMA arg
                | arg"""
     if len(p) == 4:
-        p[0] = ast.FunctionArguments(p[1].arguments + [p[3]])
+        p[1].arguments.append(p[3])
+        p[0] = p[1]
     else:
-        p[0] = ast.FunctionArguments([p[1]])
+        p[0] = _locate(p, ast.FunctionArguments([p[1]]))
 
 
 def p_empty_argument_list(p):
@@ -204,7 +204,7 @@ def p_empty_argument_list(p):
 
 def p_argument(p):
     """arg : type NAME"""
-    p[0] = ast.FunctionArgument(p[1], ast.VariableName(p[2]))
+    p[0] = _locate(p, ast.FunctionArgument(p[1], ast.VariableName(p[2])))
 
 
 def p_string(p):
@@ -220,7 +220,7 @@ def p_number(p):
 
 def p_name(p):
     """expr : NAME"""
-    p[0] = ast.VariableRead(p[1])
+    p[0] = _locate(p, ast.VariableRead(p[1]))
 
 
 def p_boolean(p):
@@ -240,7 +240,80 @@ def p_type(p):
 
 def p_print(p):
     """statement : PRINT LPAREN expr RPAREN"""
-    p[0] = ast.Print(p[3])
+    p[0] = _locate(p, ast.Print(p[3]))
+
+
+def p_error(p):
+    if p is None:
+        # the position is filled in by _run, which has the code
+        raise SyntaxError('Unexpected end of input')
+    data = p.lexer.lexdata
+    start = data.rfind('\n', 0, p.lexpos) + 1
+    end = data.find('\n', p.lexpos)
+    column = p.lexpos - start + 1
+    raise SyntaxError(f"Unexpected '{p.value}' in column {column}",
+                      (None, p.lineno, column, data[start:end if end != -1 else len(data)]))
+
+
+_parser = None
+
+
+def get_parser():
+    global _parser
+    if _parser is None:
+        # parsetab.py is only read here; if it is stale the tables are rebuilt in memory, never written
+        _parser = yacc.yacc(module=sys.modules[__name__], debug=False, write_tables=False, tabmodule='parsetab',
+                            outputdir=os.path.dirname(os.path.abspath(__file__)))
+        _parser.consume_statement = None
+    return _parser
+
+
+def new_parser():
+    # the parser keeps the state of the parse it runs on itself, so threads parsing at once need one each; the
+    # tables are shared
+    parser = copy.copy(get_parser())
+    parser.consume_statement = None
+    return parser
+
+
+def _get_lexer(lexer):
+    if lexer is None:
+        return lex.get_lexer()
+    lexer.lineno = 1
+    return lexer
+
+
+def _run(parser, code, lexer):
+    try:
+        return parser.parse(code, lexer=_get_lexer(lexer), tracking=True)
+    except SyntaxError as e:
+        if e.lineno is not None:
+            raise
+        # the input ran out; point past the end of its last line
+        lines = code.rstrip('\n').split('\n')
+        raise SyntaxError(e.msg, (None, len(lines), len(lines[-1]) + 1, lines[-1])) from None
+
+
+def parse(code, parser=None, lexer=None):
+    # the shared parser and lexer unless others are given, from new_parser() and lex.new_lexer()
+    return _run(parser or get_parser(), code, lexer)
+
+
+def parse_statements(code, consume_statement, parser=None, lexer=None):
+    # hands every top-level statement to consume_statement as soon as it is reduced instead of building a Program
+    parser = parser or get_parser()
+    parser.consume_statement = consume_statement
+    try:
+        _run(parser, code, lexer)
+    finally:
+        parser.consume_statement = None
+
+
+def write_tables():
+    outputdir = os.path.dirname(os.path.abspath(__file__))
+    lex.write_table(outputdir)
+    yacc.yacc(module=sys.modules[__name__], debug=False, write_tables=True, tabmodule='parsetab', outputdir=outputdir)
 
 
-parser = yacc.yacc()
+if __name__ == '__main__':
+    write_tables()
@@ -0,0 +1,86 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftASSIGNleftORleftANDrightNOTleftEQNEQLTLTEGTGTEleftPLUSMINUSleftTIMESDIVMODrightUMINUSrightPOWERnonassocLPARENRPARENAND ASSIGN BOOLEAN BREAK COMMA CONTINUE DIV ELSE EQ FALSE FLOAT GLOBAL GT GTE IF INT LBRACE LPAREN LT LTE MINUS MOD NAME NEQ NEWLINE NOT NUMBER OR PLUS POWER PRINT RBRACE REAL RETURN RPAREN STRING TEXT TIMES TRUE TYPECONV TYPECONV UMINUS VOID WHILEprogram : top_statementstop_statements : top_statements statement\n                      | statementstatements : statements statement\n                  | statementexpr : LPAREN expr RPARENstatement : type NAME\n                 | GLOBAL type NAMEstatement : NAME ASSIGN exprstatement : type NAME ASSIGN expr\n                 | GLOBAL type NAME ASSIGN exprexpr : expr PLUS expr\n            | expr MINUS expr\n            | expr TIMES expr\n            | expr DIV expr\n            | expr POWER expr\n            | expr MOD exprexpr : MINUS expr %prec UMINUSexpr : expr AND expr\n            | expr OR exprexpr : NOT exprexpr : expr EQ expr\n            | expr NEQ expr\n            | expr GT expr\n            | expr GTE expr\n            | expr LT expr\n            | expr LTE exprstatement : IF LPAREN expr RPAREN LBRACE statements RBRACEstatement : IF LPAREN expr RPAREN LBRACE statements RBRACE ELSE LBRACE statements RBRACEstatement : WHILE LPAREN expr RPAREN LBRACE statements RBRACEexpr : TYPECONV LPAREN expr RPARENstatement : type NAME LPAREN arglist RPAREN LBRACE statements RBRACEstatement : NAME LPAREN exprlist RPARENexpr : NAME LPAREN exprlist RPARENexprlist : exprlist COMMA expr\n                | exprexprlist :statement : RETURN exprstatement : BREAKstatement : CONTINUEarglist : arglist COMMA arg\n               | argarglist :arg : type NAMEexpr : TEXTexpr : NUMBER\n            | REALexpr : NAMEexpr : TRUE\n            | FALSEtype : STRING\n            | INT\n            | FLOAT\n            | BOOLEAN\n            | VOIDstatement : PRINT LPAREN expr RPAREN'
+    
+_lr_action_items = {'GLOBAL':([0,2,3,10,11,18,19,25,30,31,32,33,34,35,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,96,97,98,99,100,101,103,104,105,106,107,108,109,110,112,113,114,],[6,6,-3,-39,-40,-2,-7,-38,-48,-45,-46,-47,-49,-50,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,-11,6,6,-31,-34,6,6,-5,6,6,-28,-4,-30,-32,6,6,-29,]),'NAME':([0,2,3,4,9,10,11,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,30,31,32,33,34,35,36,37,39,42,45,46,47,48,49,50,51,52,53,54,55,56,57,58,60,61,62,63,65,66,69,70,71,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,96,97,98,99,100,101,103,104,105,106,107,108,109,110,112,113,114,],[5,5,-3,19,30,-39,-40,-51,-52,-53,-54,-55,-2,-7,30,30,42,30,30,-38,30,30,30,-48,-45,-46,-47,-49,-50,30,30,-9,-8,30,30,30,30,30,30,30,30,30,30,30,30,30,30,-18,-21,30,30,-10,92,-33,30,30,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,-11,5,5,-31,-34,5,5,-5,5,5,-28,-4,-30,-32,5,5,-29,]),'IF':([0,2,3,10,11,18,19,25,30,31,32,33,34,35,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,96,97,98,99,100,101,103,104,105,106,107,108,109,110,112,113,114,],[7,7,-3,-39,-40,-2,-7,-38,-48,-45,-46,-47,-49,-50,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,-11,7,7,-31,-34,7,7,-5,7,7,-28,-4,-30,-32,7,7,-29,]),'WHILE':([0,2,3,10,11,18,19,25,30,31,32,33,34,35,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,96,97,98,99,100,101,103,104,105,106,107,108,109,110,112,113,114,],[8,8,-3,-39,-40,-2,-7,-38,-48,-45,-46,-47,-49,-50,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,-11,8,8,-31,-34,8,8,-5,8,8,-28,-4,-30,-32,8,8,-29,]),'RETURN':([0,2,3,10,11,18,19,25,30,31,32,33,34,35,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,96,97,98,99,100,101,103,104,105,106,107,108,109,110,112,113,114,],[9,9,-3,-39,-40,-2,-7,-38,-48,-45,-46,-47,-49,-50,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,-11,9,9,-31,-34,9,9,-5,9,9,-28,-4,-30,-32,9,9,-29,]),'BREAK':([0,2,3,10,11,18,19,25,30,31,32,33,34,35,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,96,97,98,99,100,101,103,104,105,106,107,108,109,110,112,113,114,],[10,10,-3,-39,-40,-2,-7,-38,-48,-45,-46,-47,-49,-50,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,-11,10,10,-31,-34,10,10,-5,10,10,-28,-4,-30,-32,10,10,-29,]),'CONTINUE':([0,2,3,10,11,18,19,25,30,31,32,33,34,35,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,96,97,98,99,100,101,103,104,105,106,107,108,109,110,112,113,114,],[11,11,-3,-39,-40,-2,-7,-38,-48,-45,-46,-47,-49,-50,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,-11,11,11,-31,-34,11,11,-5,11,11,-28,-4,-30,-32,11,11,-29,]),'PRINT':([0,2,3,10,11,18,19,25,30,31,32,33,34,35,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,96,97,98,99,100,101,103,104,105,106,107,108,109,110,112,113,114,],[12,12,-3,-39,-40,-2,-7,-38,-48,-45,-46,-47,-49,-50,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,-11,12,12,-31,-34,12,12,-5,12,12,-28,-4,-30,-32,12,12,-29,]),'STRING':([0,2,3,6,10,11,18,19,25,30,31,32,33,34,35,38,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,94,96,97,98,99,100,101,103,104,105,106,107,108,109,110,112,113,114,],[13,13,-3,13,-39,-40,-2,-7,-38,-48,-45,-46,-47,-49,-50,13,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,13,-11,13,13,-31,-34,13,13,-5,13,13,-28,-4,-30,-32,13,13,-29,]),'INT':([0,2,3,6,10,11,18,19,25,30,31,32,33,34,35,38,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,94,96,97,98,99,100,101,103,104,105,106,107,108,109,110,112,113,114,],[14,14,-3,14,-39,-40,-2,-7,-38,-48,-45,-46,-47,-49,-50,14,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,14,-11,14,14,-31,-34,14,14,-5,14,14,-28,-4,-30,-32,14,14,-29,]),'FLOAT':([0,2,3,6,10,11,18,19,25,30,31,32,33,34,35,38,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,94,96,97,98,99,100,101,103,104,105,106,107,108,109,110,112,113,114,],[15,15,-3,15,-39,-40,-2,-7,-38,-48,-45,-46,-47,-49,-50,15,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,15,-11,15,15,-31,-34,15,15,-5,15,15,-28,-4,-30,-32,15,15,-29,]),'BOOLEAN':([0,2,3,6,10,11,18,19,25,30,31,32,33,34,35,38,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,94,96,97,98,99,100,101,103,104,105,106,107,108,109,110,112,113,114,],[16,16,-3,16,-39,-40,-2,-7,-38,-48,-45,-46,-47,-49,-50,16,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,16,-11,16,16,-31,-34,16,16,-5,16,16,-28,-4,-30,-32,16,16,-29,]),'VOID':([0,2,3,6,10,11,18,19,25,30,31,32,33,34,35,38,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,94,96,97,98,99,100,101,103,104,105,106,107,108,109,110,112,113,114,],[17,17,-3,17,-39,-40,-2,-7,-38,-48,-45,-46,-47,-49,-50,17,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,17,-11,17,17,-31,-34,17,17,-5,17,17,-28,-4,-30,-32,17,17,-29,]),'$end':([1,2,3,10,11,18,19,25,30,31,32,33,34,35,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,96,99,100,107,109,110,114,],[0,-1,-3,-39,-40,-2,-7,-38,-48,-45,-46,-47,-49,-50,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,-11,-31,-34,-28,-30,-32,-29,]),'ASSIGN':([5,19,42,],[20,37,71,]),'LPAREN':([5,7,8,9,12,19,20,21,23,24,26,27,28,29,30,36,37,45,46,47,48,49,50,51,52,53,54,55,56,57,58,62,63,70,71,],[21,23,24,26,36,38,26,26,26,26,26,26,26,62,63,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,]),'MINUS':([9,20,21,23,24,25,26,27,28,30,31,32,33,34,35,36,37,39,41,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,70,71,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[27,27,27,27,27,46,27,27,27,-48,-45,-46,-47,-49,-50,27,27,46,46,46,46,27,27,27,27,27,27,27,27,27,27,27,27,27,27,46,-18,46,27,27,46,46,27,27,-12,-13,-14,-15,-16,-17,46,46,46,46,46,46,46,46,-6,46,46,46,-31,-34,]),'NOT':([9,20,21,23,24,26,27,28,36,37,45,46,47,48,49,50,51,52,53,54,55,56,57,58,62,63,70,71,],[28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,]),'TYPECONV':([9,20,21,23,24,26,27,28,36,37,45,46,47,48,49,50,51,52,53,54,55,56,57,58,62,63,70,71,],[29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,]),'TEXT':([9,20,21,23,24,26,27,28,36,37,45,46,47,48,49,50,51,52,53,54,55,56,57,58,62,63,70,71,],[31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,]),'NUMBER':([9,20,21,23,24,26,27,28,36,37,45,46,47,48,49,50,51,52,53,54,55,56,57,58,62,63,70,71,],[32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,]),'REAL':([9,20,21,23,24,26,27,28,36,37,45,46,47,48,49,50,51,52,53,54,55,56,57,58,62,63,70,71,],[33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,]),'TRUE':([9,20,21,23,24,26,27,28,36,37,45,46,47,48,49,50,51,52,53,54,55,56,57,58,62,63,70,71,],[34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,]),'FALSE':([9,20,21,23,24,26,27,28,36,37,45,46,47,48,49,50,51,52,53,54,55,56,57,58,62,63,70,71,],[35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,]),'RBRACE':([10,11,19,25,30,31,32,33,34,35,39,42,60,61,65,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,91,96,99,100,103,104,105,106,107,108,109,110,113,114,],[-39,-40,-7,-38,-48,-45,-46,-47,-49,-50,-9,-8,-18,-21,-10,-33,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,-56,-11,-31,-34,107,-5,109,110,-28,-4,-30,-32,114,-29,]),'RPAREN':([21,30,31,32,33,34,35,38,40,41,43,44,59,60,61,63,64,67,68,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,92,95,99,100,102,],[-37,-48,-45,-46,-47,-49,-50,-43,69,-36,72,73,88,-18,-21,-37,91,93,-42,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,99,100,-44,-35,-31,-34,-41,]),'COMMA':([21,30,31,32,33,34,35,38,40,41,60,61,63,67,68,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,90,92,95,99,100,102,],[-37,-48,-45,-46,-47,-49,-50,-43,70,-36,-18,-21,-37,94,-42,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,70,-44,-35,-31,-34,-41,]),'PLUS':([25,30,31,32,33,34,35,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[45,-48,-45,-46,-47,-49,-50,45,45,45,45,45,-18,45,45,45,-12,-13,-14,-15,-16,-17,45,45,45,45,45,45,45,45,-6,45,45,45,-31,-34,]),'TIMES':([25,30,31,32,33,34,35,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[47,-48,-45,-46,-47,-49,-50,47,47,47,47,47,-18,47,47,47,47,47,-14,-15,-16,-17,47,47,47,47,47,47,47,47,-6,47,47,47,-31,-34,]),'DIV':([25,30,31,32,33,34,35,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[48,-48,-45,-46,-47,-49,-50,48,48,48,48,48,-18,48,48,48,48,48,-14,-15,-16,-17,48,48,48,48,48,48,48,48,-6,48,48,48,-31,-34,]),'POWER':([25,30,31,32,33,34,35,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[49,-48,-45,-46,-47,-49,-50,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,-6,49,49,49,-31,-34,]),'MOD':([25,30,31,32,33,34,35,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[50,-48,-45,-46,-47,-49,-50,50,50,50,50,50,-18,50,50,50,50,50,-14,-15,-16,-17,50,50,50,50,50,50,50,50,-6,50,50,50,-31,-34,]),'AND':([25,30,31,32,33,34,35,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[51,-48,-45,-46,-47,-49,-50,51,51,51,51,51,-18,-21,51,51,-12,-13,-14,-15,-16,-17,-19,51,-22,-23,-24,-25,-26,-27,-6,51,51,51,-31,-34,]),'OR':([25,30,31,32,33,34,35,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[52,-48,-45,-46,-47,-49,-50,52,52,52,52,52,-18,-21,52,52,-12,-13,-14,-15,-16,-17,-19,-20,-22,-23,-24,-25,-26,-27,-6,52,52,52,-31,-34,]),'EQ':([25,30,31,32,33,34,35,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[53,-48,-45,-46,-47,-49,-50,53,53,53,53,53,-18,53,53,53,-12,-13,-14,-15,-16,-17,53,53,-22,-23,-24,-25,-26,-27,-6,53,53,53,-31,-34,]),'NEQ':([25,30,31,32,33,34,35,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[54,-48,-45,-46,-47,-49,-50,54,54,54,54,54,-18,54,54,54,-12,-13,-14,-15,-16,-17,54,54,-22,-23,-24,-25,-26,-27,-6,54,54,54,-31,-34,]),'GT':([25,30,31,32,33,34,35,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[55,-48,-45,-46,-47,-49,-50,55,55,55,55,55,-18,55,55,55,-12,-13,-14,-15,-16,-17,55,55,-22,-23,-24,-25,-26,-27,-6,55,55,55,-31,-34,]),'GTE':([25,30,31,32,33,34,35,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[56,-48,-45,-46,-47,-49,-50,56,56,56,56,56,-18,56,56,56,-12,-13,-14,-15,-16,-17,56,56,-22,-23,-24,-25,-26,-27,-6,56,56,56,-31,-34,]),'LT':([25,30,31,32,33,34,35,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[57,-48,-45,-46,-47,-49,-50,57,57,57,57,57,-18,57,57,57,-12,-13,-14,-15,-16,-17,57,57,-22,-23,-24,-25,-26,-27,-6,57,57,57,-31,-34,]),'LTE':([25,30,31,32,33,34,35,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,95,96,99,100,],[58,-48,-45,-46,-47,-49,-50,58,58,58,58,58,-18,58,58,58,-12,-13,-14,-15,-16,-17,58,58,-22,-23,-24,-25,-26,-27,-6,58,58,58,-31,-34,]),'LBRACE':([72,73,93,111,],[97,98,101,112,]),'ELSE':([107,],[111,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'top_statements':([0,],[2,]),'statement':([0,2,97,98,101,103,105,106,112,113,],[3,18,104,104,104,108,108,108,104,108,]),'type':([0,2,6,38,94,97,98,101,103,105,106,112,113,],[4,4,22,66,66,4,4,4,4,4,4,4,4,]),'expr':([9,20,21,23,24,26,27,28,36,37,45,46,47,48,49,50,51,52,53,54,55,56,57,58,62,63,70,71,],[25,39,41,43,44,59,60,61,64,65,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,41,95,96,]),'exprlist':([21,63,],[40,90,]),'arglist':([38,],[67,]),'arg':([38,94,],[68,102,]),'statements':([97,98,101,112,],[103,105,106,113,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> top_statements','program',1,'p_input','parse.py',25),
+  ('top_statements -> top_statements statement','top_statements',2,'p_top_lines','parse.py',30),
+  ('top_statements -> statement','top_statements',1,'p_top_lines','parse.py',31),
+  ('statements -> statements statement','statements',2,'p_lines','parse.py',41),
+  ('statements -> statement','statements',1,'p_lines','parse.py',42),
+  ('expr -> LPAREN expr RPAREN','expr',3,'p_parentheses','parse.py',51),
+  ('statement -> type NAME','statement',2,'p_declaration','parse.py',56),
+  ('statement -> GLOBAL type NAME','statement',3,'p_declaration','parse.py',57),
+  ('statement -> NAME ASSIGN expr','statement',3,'p_assignment','parse.py',65),
+  ('statement -> type NAME ASSIGN expr','statement',4,'p_assignment_and_declaration','parse.py',70),
+  ('statement -> GLOBAL type NAME ASSIGN expr','statement',5,'p_assignment_and_declaration','parse.py',71),
+  ('expr -> expr PLUS expr','expr',3,'p_binary_math_operator','parse.py',79),
+  ('expr -> expr MINUS expr','expr',3,'p_binary_math_operator','parse.py',80),
+  ('expr -> expr TIMES expr','expr',3,'p_binary_math_operator','parse.py',81),
+  ('expr -> expr DIV expr','expr',3,'p_binary_math_operator','parse.py',82),
+  ('expr -> expr POWER expr','expr',3,'p_binary_math_operator','parse.py',83),
+  ('expr -> expr MOD expr','expr',3,'p_binary_math_operator','parse.py',84),
+  ('expr -> MINUS expr','expr',2,'p_unary_math_operator','parse.py',89),
+  ('expr -> expr AND expr','expr',3,'p_binary_logical_operator','parse.py',94),
+  ('expr -> expr OR expr','expr',3,'p_binary_logical_operator','parse.py',95),
+  ('expr -> NOT expr','expr',2,'p_unary_logical_operator','parse.py',100),
+  ('expr -> expr EQ expr','expr',3,'p_comparison','parse.py',105),
+  ('expr -> expr NEQ expr','expr',3,'p_comparison','parse.py',106),
+  ('expr -> expr GT expr','expr',3,'p_comparison','parse.py',107),
+  ('expr -> expr GTE expr','expr',3,'p_comparison','parse.py',108),
+  ('expr -> expr LT expr','expr',3,'p_comparison','parse.py',109),
+  ('expr -> expr LTE expr','expr',3,'p_comparison','parse.py',110),
+  ('statement -> IF LPAREN expr RPAREN LBRACE statements RBRACE','statement',7,'p_if','parse.py',115),
+  ('statement -> IF LPAREN expr RPAREN LBRACE statements RBRACE ELSE LBRACE statements RBRACE','statement',11,'p_if_else','parse.py',120),
+  ('statement -> WHILE LPAREN expr RPAREN LBRACE statements RBRACE','statement',7,'p_while','parse.py',125),
+  ('expr -> TYPECONV LPAREN expr RPAREN','expr',4,'p_type_conversion','parse.py',130),
+  ('statement -> type NAME LPAREN arglist RPAREN LBRACE statements RBRACE','statement',8,'p_function_declaration','parse.py',138),
+  ('statement -> NAME LPAREN exprlist RPAREN','statement',4,'p_function_call','parse.py',143),
+  ('expr -> NAME LPAREN exprlist RPAREN','expr',4,'p_function_call_expr','parse.py',148),
+  ('exprlist -> exprlist COMMA expr','exprlist',3,'p_expression_list','parse.py',153),
+  ('exprlist -> expr','exprlist',1,'p_expression_list','parse.py',154),
+  ('exprlist -> <empty>','exprlist',0,'p_expression_list_empty','parse.py',163),
+  ('statement -> RETURN expr','statement',2,'p_return','parse.py',168),
+  ('statement -> BREAK','statement',1,'p_break','parse.py',173),
+  ('statement -> CONTINUE','statement',1,'p_continue','parse.py',178),
+  ('arglist -> arglist COMMA arg','arglist',3,'p_argument_list','parse.py',183),
+  ('arglist -> arg','arglist',1,'p_argument_list','parse.py',184),
+  ('arglist -> <empty>','arglist',0,'p_empty_argument_list','parse.py',193),
+  ('arg -> type NAME','arg',2,'p_argument','parse.py',198),
+  ('expr -> TEXT','expr',1,'p_string','parse.py',203),
+  ('expr -> NUMBER','expr',1,'p_number','parse.py',208),
+  ('expr -> REAL','expr',1,'p_number','parse.py',209),
+  ('expr -> NAME','expr',1,'p_name','parse.py',214),
+  ('expr -> TRUE','expr',1,'p_boolean','parse.py',219),
+  ('expr -> FALSE','expr',1,'p_boolean','parse.py',220),
+  ('type -> STRING','type',1,'p_type','parse.py',225),
+  ('type -> INT','type',1,'p_type','parse.py',226),
+  ('type -> FLOAT','type',1,'p_type','parse.py',227),
+  ('type -> BOOLEAN','type',1,'p_type','parse.py',228),
+  ('type -> VOID','type',1,'p_type','parse.py',229),
+  ('statement -> PRINT LPAREN expr RPAREN','statement',4,'p_print','parse.py',234),
+]
@@ -0,0 +1,106 @@
+import time
+
+import ast
+import hooks
+
+# a block or argument list starts where its first item does, but its time belongs to the statement holding it
+_containers = (ast.Lines, ast.FunctionArguments, ast.FunctionCallArguments)
+
+
+class Profiler(hooks.Hooks):
+    # Times every node the tree walker evaluates, through hooks on an instrumented copy of the tree, so programs that
+    # are not profiled pay nothing. Nodes without a position of their own, like literals and what the optimizer made up,
+    # count on the line of the node that evaluated them; the program and its top-level block count under a '?' line of
+    # their own.
+    def __init__(self, code=''):
+        self.source = code.splitlines()
+        # count, total and self nanoseconds, and how many evaluations are running, per source line and per node type
+        self.lines = {}
+        self.nodes = {}
+        # every distinct stack of frames gets an index, and the self time spent with exactly that stack
+        self.paths = {}
+        self.path_frames = []
+        self.path_times = []
+        self.frames = []
+
+    def run(self, root, name_table):
+        hooks.run(root, self, name_table)
+        return self
+
+    def enter_node(self, node):
+        frames = self.frames
+        parent = frames[-1] if frames else None
+        if parent is None:
+            # the program itself is located at its first token, but its overhead is not that line's
+            line = None
+        elif node.line is None or isinstance(node, _containers):
+            line = parent[1]
+        else:
+            line = node.line
+        node_type = type(node).__name__
+        key = (parent[0] if parent else None, node_type if line is None else f'{node_type}:{line}')
+        path = self.paths.get(key)
+        if path is None:
+            path = self.paths[key] = len(self.path_frames)
+            self.path_frames.append(key)
+            self.path_times.append(0)
+        for stats, name in ((self.lines, line), (self.nodes, node_type)):
+            entry = stats.get(name)
+            if entry is None:
+                entry = stats[name] = [0, 0, 0, 0]
+            entry[3] += 1
+        frames.append([path, line, node_type, 0, time.perf_counter_ns()])
+
+    def exit_node(self, node, value):
+        path, line, node_type, children, start = self.frames.pop()
+        elapsed = time.perf_counter_ns() - start
+        if self.frames:
+            self.frames[-1][3] += elapsed
+        self.path_times[path] += elapsed - children
+        for entry in (self.lines[line], self.nodes[node_type]):
+            entry[0] += 1
+            entry[2] += elapsed - children
+            entry[3] -= 1
+            # recursion would count the same time again, so only the outermost evaluation adds to the total
+            if not entry[3]:
+                entry[1] += elapsed
+
+    def get_source(self, line):
+        if line is None:
+            return '<program>'
+        if not 0 < line <= len(self.source):
+            return ''
+        return self.source[line - 1].strip()
+
+    def report(self, limit=20):
+        lines = sorted(self.lines.items(), key=lambda item: -item[1][2])[:limit]
+        nodes = sorted(self.nodes.items(), key=lambda item: -item[1][2])[:limit]
+        ret = f"{'line':>6} {'count':>10} {'total ms':>10} {'self ms':>10}  source\n"
+        for line, (count, total, self_time, _) in lines:
+            ret += f"{'?' if line is None else line:>6} {count:>10} {total / 1e6:>10.3f} {self_time / 1e6:>10.3f}  " \
+                   f"{self.get_source(line)}\n"
+        ret += f"\n{'node':<32} {'count':>10} {'total ms':>10} {'self ms':>10}\n"
+        for node_type, (count, total, self_time, _) in nodes:
+            ret += f'{node_type:<32} {count:>10} {total / 1e6:>10.3f} {self_time / 1e6:>10.3f}\n'
+        return ret
+
+    def folded_stacks(self):
+        # one 'frame;frame;frame microseconds' line per stack, the input flamegraph.pl and speedscope expect
+        stacks = []
+        for path, (parent, frame) in enumerate(self.path_frames):
+            if self.path_times[path] < 1000:
+                continue
+            frames = [frame]
+            while parent is not None:
+                parent, frame = self.path_frames[parent]
+                frames.append(frame)
+            stacks.append(f"{';'.join(reversed(frames))} {self.path_times[path] // 1000}")
+        return '\n'.join(stacks) + '\n'
+
+    def write_folded_stacks(self, filename):
+        with open(filename, 'w') as file:
+            file.write(self.folded_stacks())
+
+
+def profile(root, name_table, code=''):
+    return Profiler(code).run(root, name_table)
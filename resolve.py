@@ -0,0 +1,84 @@
+import ast
+
+
+class Scope:
+    def __init__(self):
+        self.slots = {}
+        self.size = 0
+
+    def add(self, name):
+        if name not in self.slots:
+            self.add_argument(name)
+        return self.slots[name]
+
+    def add_argument(self, name):
+        self.slots[name] = self.size
+        self.size += 1
+
+
+class Resolver:
+    # Each block owns one scope list of a names.Frame, at the depth a NameTable would give it, with a slot
+    # for every name declared in it. Declarations only count once they ran, so an access keeps every
+    # slot its name may live in, innermost first, and the frame picks the first declared one.
+    def __init__(self):
+        self.accesses = []
+        self.scopes = []
+
+    def resolve(self, root):
+        self.visit(root, ())
+        self.finish()
+        return root
+
+    def resolve_statement(self, statement, scope):
+        # for top-level statements run one by one against a program scope that grows between them
+        self.visit(statement, (scope,))
+        self.finish()
+        return statement
+
+    def finish(self):
+        for node, chain, name in self.accesses:
+            node.addresses = tuple((depth, chain[depth].slots[name])
+                                   for depth in reversed(range(len(chain))) if name in chain[depth].slots)
+        for node, scope in self.scopes:
+            node.scope_size = scope.size
+        self.accesses, self.scopes = [], []
+
+    def new_scope(self, node):
+        scope = Scope()
+        self.scopes.append((node, scope))
+        return scope
+
+    def visit(self, node, chain):
+        if isinstance(node, ast.VariableRead):
+            self.accesses.append((node, chain, node.name))
+        elif isinstance(node, (ast.Declaration, ast.DeclarationWithAssignment, ast.Assignment)):
+            name = node.var_name.name
+            if not isinstance(node, ast.Assignment):
+                depth = 0 if node.is_global else len(chain) - 1
+                node.address = (depth, chain[depth].add(name))
+            self.accesses.append((node, chain, name))
+        elif isinstance(node, ast.Program):
+            self.visit(node.program, (self.new_scope(node),))
+            return
+        elif isinstance(node, ast.FunctionDeclaration):
+            scope = self.new_scope(node)
+            for argument in node.arguments.arguments:
+                scope.add_argument(argument.arg_name.name)
+            self.visit(node.body, (scope,))
+            return
+        elif isinstance(node, (ast.IfStatement, ast.WhileStatement)):
+            self.visit(node.condition, chain)
+            self.visit(node.statement, chain + (self.new_scope(node),))
+            return
+        elif isinstance(node, ast.IfElseStatement):
+            self.visit(node.condition, chain)
+            scope = self.new_scope(node)
+            self.visit(node.on_true_statement, chain + (scope,))
+            self.visit(node.on_false_statement, chain + (scope,))
+            return
+        for child in node.get_children():
+            self.visit(child, chain)
+
+
+def resolve(root):
+    return Resolver().resolve(root)
@@ -0,0 +1,59 @@
+import os
+import sys
+
+# characters held before a write
+max_buffered = 1 << 16
+
+
+class BufferedOutput:
+    # Where print statements write. Lines are joined and written at once when the buffer fills up, when the
+    # program ends or on flush(); the file is looked up on every write, so sys.stdout may be redirected meanwhile.
+    def __init__(self, file=None, buffer_size=None):
+        self.file = file
+        self.buffer_size = max_buffered if buffer_size is None else buffer_size
+        self.parts = []
+        self.size = 0
+
+    def print(self, value):
+        text = f'{value}\n'
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.parts:
+            text = ''.join(self.parts)
+            self.parts.clear()
+            self.size = 0
+            self.write(text)
+
+    def write(self, text):
+        file = sys.stdout if self.file is None else self.file
+        file.write(text)
+        file.flush()
+
+
+class DescriptorOutput(BufferedOutput):
+    # Writes straight to a file descriptor, past any buffering of Python file objects
+    def __init__(self, fd, buffer_size=None, encoding='utf-8'):
+        super().__init__(None, buffer_size)
+        self.fd = fd
+        self.encoding = encoding
+
+    def write(self, text):
+        data = memoryview(text.encode(self.encoding))
+        while data:
+            data = data[os.write(self.fd, data):]
+
+
+class ListOutput:
+    # Keeps every printed line, without its newline, for callers that want the output as values
+    def __init__(self):
+        self.lines = []
+
+    def print(self, value):
+        self.lines.append(str(value))
+
+    def flush(self):
+        pass
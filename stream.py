@@ -0,0 +1,95 @@
+import ast
+import closures
+import helpers
+import lex
+import names
+import optimize
+import parse
+import resolve
+import typecheck
+
+
+class StatementStream:
+    # Runs every top-level statement as soon as the parser reduces it, so no Program tree is ever kept.
+    # Statements are type-specialized one at a time, which only sees what a single statement proves.
+    def __init__(self, engine='tree', name_table=None):
+        self.name_table = name_table or names.NameTable()
+        self.returned = False
+        self.frame = None
+        if engine == 'tree':
+            self.run = self.run_tree
+        elif engine == 'closure':
+            self.run = self.run_closure
+            self.scope = resolve.Scope()
+            self.resolver = resolve.Resolver()
+            self.frame = names.Frame([], [], self.name_table.functions, self.name_table.output)
+        else:
+            raise ValueError(f"Engine '{engine}' cannot run statements one by one")
+
+    def __call__(self, statement):
+        if self.returned:
+            return
+        helpers.check_jumps(statement)
+        program = optimize.fold_constants(ast.Program(ast.Lines([statement])))
+        program = optimize.eliminate_common_subexpressions(optimize.hoist_loop_invariants(program))
+        # code motion may put hidden declarations in front of the statement
+        for statement in typecheck.specialize(program).program.lines:
+            # a return anywhere at the top level, even inside a block, ends the program
+            if self.run(statement) is not None and statement.transfers_control:
+                self.returned = True
+                return
+
+    def run_tree(self, statement):
+        return statement.evaluate(self.name_table)
+
+    def run_closure(self, statement):
+        self.resolver.resolve_statement(statement, self.scope)
+        missing = self.scope.size - len(self.frame.values[0])
+        self.frame.values[0].extend([None] * missing)
+        self.frame.types[0].extend([None] * missing)
+        return closures.compile_node(statement)(self.frame)
+
+
+class Session:
+    # Keeps one name table across snippets of code and only parses and runs each new snippet, for a REPL
+    def __init__(self, engine='tree', name_table=None):
+        self.statements = StatementStream(engine, name_table)
+        self.parser, self.lexer = parse.new_parser(), lex.new_lexer()
+
+    @property
+    def name_table(self):
+        return self.statements.name_table
+
+    def run(self, code):
+        if not code.strip():
+            return
+        # a snippet that does not parse raises before any of it runs
+        root = parse.parse(code, self.parser, self.lexer)
+        statements = self.statements
+        # a return at the top level only ends the snippet it is in
+        statements.returned = False
+        try:
+            for statement in root.program.lines:
+                statements(statement)
+        except Exception:
+            # a statement that failed inside a block leaves the scopes of its blocks behind
+            del statements.name_table.variables[1:]
+            if statements.frame is not None:
+                del statements.frame.values[1:], statements.frame.types[1:]
+            raise
+        finally:
+            statements.name_table.output.flush()
+
+
+def execute(code, engine='tree', name_table=None):
+    statements = StatementStream(engine, name_table)
+    try:
+        parse.parse_statements(code, statements)
+    finally:
+        statements.name_table.output.flush()
+
+
+def execute_file(filename, engine='tree', name_table=None):
+    # PLY lexes a str, so the file is read whole; only the syntax tree is never held at once
+    with open(filename, 'r') as file:
+        execute(file.read(), engine, name_table)
@@ -0,0 +1,473 @@
+# The project's ast.py shadows the standard library module, so Python syntax trees are built from _ast directly.
+import _ast
+
+import ast
+import helpers
+import inference
+import memo
+import optimize
+
+_UNDECLARED = object()
+
+_list_fields = {
+    'body', 'orelse', 'args', 'keywords', 'targets', 'elts', 'keys', 'values', 'ops', 'comparators',
+    'decorator_list', 'type_ignores', 'type_params', 'posonlyargs', 'kwonlyargs', 'kw_defaults', 'defaults', 'names',
+}
+
+_binary_operators = {'+': _ast.Add, '-': _ast.Sub, '*': _ast.Mult, '/': _ast.Div, '^': _ast.Pow, '%': _ast.Mod}
+_comparison_operators = {'=': _ast.Eq, '≠': _ast.NotEq, '>': _ast.Gt, '>=': _ast.GtE, '<': _ast.Lt, '<=': _ast.LtE}
+_math_helpers = {'+': '_add', '-': '_sub', '*': '_mul', '/': '_div', '^': '_pow', '%': '_mod'}
+_comparison_helpers = {'=': '_eq', '≠': '_ne', '>': '_gt', '>=': '_ge', '<': '_lt', '<=': '_le'}
+_type_names = {int: 'int', float: 'float', str: 'str', bool: 'bool', type(None): '_NoneType'}
+
+
+class TranspileError(Exception):
+    pass
+
+
+def _undeclared_function(name):
+    raise ValueError(f"Function '{name}' has not been declared")
+
+
+def _get_function(functions, name):
+    if name not in functions:
+        _undeclared_function(name)
+    return functions[name]
+
+
+def _declare_function(functions, name, spec):
+    if name in functions:
+        raise ValueError(f"Function '{name}' was already declared")
+    functions[name] = spec
+
+
+def _read(value, name):
+    if value is _UNDECLARED:
+        raise KeyError(f"Variable '{name}' was not declared")
+    if value is None:
+        raise ValueError(f"Variable '{name}' referenced before assignment")
+    return value
+
+
+def _declare(value, name):
+    if value is not _UNDECLARED:
+        raise ValueError(f"Variable '{name}' was already declared")
+
+
+def _void_variable():
+    raise ValueError("Variables cannot be of type void")
+
+
+def _assign(current, value, var_type, name):
+    if current is _UNDECLARED:
+        raise KeyError(f"'{name}' was not declared")
+    return _check_assign(value, var_type)
+
+
+def _check_assign(value, var_type):
+    if isinstance(value, var_type):
+        return value
+    raise TypeError("Type mismatch between declared and assigned value")
+
+
+def _check_bool(value):
+    helpers.check_boolean_type(value)
+    return value
+
+
+def _check_return(value, return_type):
+    if not isinstance(value, return_type):
+        raise TypeError(f"Value returned from function is of type {type(value)} but expected {return_type}")
+    return value
+
+
+def _check_arguments(values, types):
+    for index, (expected_type, value) in enumerate(zip(types, values)):
+        if expected_type != (actual_type := type(value)):
+            raise TypeError(f"Type mismatch in argument number {index}: expected {expected_type}, got {actual_type}")
+    return values
+
+
+def _call(function_spec, display_name, values):
+    if (required := len(function_spec['arguments'])) != (provided := len(values)):
+        raise ValueError(f"Function '{display_name}' requires {required} arguments but got {provided}")
+    _check_arguments(values, [argument[0] for argument in function_spec['arguments']])
+    return function_spec['body'](*values)
+
+
+def _memoize(function, name):
+    cache = memo.FunctionCache(name)
+
+    def cached(*values):
+        return cache.call(values, function, *values)
+    cached.cache = cache
+    return cached
+
+
+def _logical_and(l, r):
+    helpers.check_boolean_type(l, r)
+    return l and r
+
+
+def _logical_or(l, r):
+    helpers.check_boolean_type(l, r)
+    return l or r
+
+
+def _negate(o):
+    helpers.check_numeric_type(o)
+    return -o
+
+
+def _not(o):
+    helpers.check_boolean_type(o)
+    return not o
+
+
+def _int_to_float(o):
+    helpers.check_int_type(o)
+    return float(o)
+
+
+def _float_to_int(o):
+    helpers.check_float_type(o)
+    return int(o)
+
+
+runtime = {
+    '_UNDECLARED': _UNDECLARED, '_NoneType': type(None),
+    '_undeclared_function': _undeclared_function, '_get_function': _get_function,
+    '_declare_function': _declare_function, '_read': _read, '_declare': _declare, '_void_variable': _void_variable,
+    '_assign': _assign, '_check_assign': _check_assign, '_check_bool': _check_bool, '_check_return': _check_return,
+    '_check_arguments': _check_arguments, '_call': _call, '_memoize': _memoize, '_logical_and': _logical_and,
+    '_logical_or': _logical_or,
+    '_negate': _negate, '_not': _not, '_int_to_float': _int_to_float, '_float_to_int': _float_to_int,
+}
+runtime.update({name: helpers.math_operation(operation) for operation, name in _math_helpers.items()})
+runtime.update({name: helpers.comparison_operation(operation) for operation, name in _comparison_helpers.items()})
+
+
+def node(node_class, **fields):
+    for field in node_class._fields:
+        fields.setdefault(field, [] if field in _list_fields else None)
+    for attribute in node_class._attributes:
+        fields[attribute] = 0 if attribute.endswith('col_offset') else 1
+    return node_class(**fields)
+
+
+def load(name):
+    return node(_ast.Name, id=name, ctx=_ast.Load())
+
+
+def store(name, value):
+    return node(_ast.Assign, targets=[node(_ast.Name, id=name, ctx=_ast.Store())], value=value)
+
+
+def constant(value):
+    return node(_ast.Constant, value=value)
+
+
+def call(function, *args):
+    return node(_ast.Call, func=load(function) if isinstance(function, str) else function, args=list(args))
+
+
+def statement(value):
+    return node(_ast.Expr, value=value)
+
+
+def variable(name):
+    if optimize.is_hidden(name):
+        return 'h_' + name[1:]
+    return 'v_' + name
+
+
+def type_name(python_type):
+    if python_type is None:
+        raise TranspileError("Variable is declared with different types on different paths")
+    return load(_type_names[python_type])
+
+
+def _names_in_body(body):
+    used = set()
+
+    def traverse(n):
+        if isinstance(n, ast.FunctionDeclaration):
+            return
+        if isinstance(n, ast.VariableRead):
+            used.add(n.name)
+        elif isinstance(n, (ast.Declaration, ast.Assignment, ast.DeclarationWithAssignment)):
+            used.add(n.var_name.name)
+        for child in n.get_children():
+            traverse(child)
+
+    for line in body.lines:
+        traverse(line)
+    return used
+
+
+class Transpiler:
+    def __init__(self, root):
+        self.root = root
+        self.inference = inference.infer(root)
+        self.function_names = {}
+        self.temps = 0
+        # the names declared so far in each open block, and for each open loop the blocks outside it and its condition
+        self.blocks = []
+        self.loops = []
+
+    def transpile(self):
+        definitions = []
+        self._collect_functions(self.root.program, definitions)
+        body = []
+        for declaration in definitions:
+            body.append(self.function(declaration))
+            if declaration.pure:
+                name = self.function_names[id(declaration)]
+                body.append(store(name, call('_memoize', load(name), constant(declaration.function_name.name))))
+        body.append(self.body('_program', [], self.root.program, None))
+        body.append(node(_ast.Return, value=load('_program')))
+        make = node(_ast.FunctionDef, name='_make', body=body,
+                    args=node(_ast.arguments, args=[node(_ast.arg, arg='_functions')]))
+        return node(_ast.Module, body=[make])
+
+    def _collect_functions(self, n, definitions):
+        if isinstance(n, ast.FunctionDeclaration):
+            self.function_names[id(n)] = f'f_{n.function_name.name}_{len(definitions)}'
+            definitions.append(n)
+        for child in n.get_children():
+            self._collect_functions(child, definitions)
+
+    def function(self, declaration):
+        arguments = [argument.arg_name.name for argument in declaration.arguments.arguments]
+        return_type = helpers.to_python_type(declaration.return_type.name)
+        return self.body(self.function_names[id(declaration)], arguments, declaration.body, return_type)
+
+    def body(self, name, arguments, lines, return_type):
+        self.return_type = return_type
+        self.temps = 0
+        statements = self.lines(lines)
+        if not statements or not isinstance(statements[-1], _ast.Return):
+            if return_type is None or return_type is type(None):
+                statements.append(node(_ast.Return))
+            else:
+                statements.append(node(_ast.Return, value=call('_check_return', constant(None), type_name(return_type))))
+        local_names = sorted(_names_in_body(lines) - set(arguments))
+        initialization = [store(variable(local_name), load('_UNDECLARED')) for local_name in local_names]
+        return node(_ast.FunctionDef, name=name, body=initialization + statements,
+                    args=node(_ast.arguments, args=[node(_ast.arg, arg=variable(argument)) for argument in arguments]))
+
+    def temp(self):
+        self.temps += 1
+        return f'_t{self.temps - 1}'
+
+    def lines(self, lines):
+        statements = []
+        for line in lines.lines:
+            if isinstance(line, ast.ReturnStatement):
+                return statements + self.return_statement(line)
+            if isinstance(line, (ast.Break, ast.Continue)):
+                return statements + self.jump(line)
+            statements += self.statement(line)
+            if isinstance(line, (ast.Declaration, ast.DeclarationWithAssignment)) and not line.is_global and self.blocks:
+                self.blocks[-1].append(line.var_name.name)
+        return statements
+
+    def block(self, lines):
+        self.blocks.append([])
+        statements = self.lines(lines)
+        statements += self.leave_blocks(len(self.blocks) - 1)
+        self.blocks.pop()
+        return statements or [node(_ast.Pass)]
+
+    def leave_blocks(self, depth):
+        # Python has no block scopes, so whatever a block declared is undeclared again when it is left
+        return [store(variable(name), load('_UNDECLARED')) for names in self.blocks[depth:] for name in names]
+
+    def jump(self, line):
+        depth, temp, condition = self.loops[-1]
+        statements = self.leave_blocks(depth)
+        if isinstance(line, ast.Break):
+            return statements + [node(_ast.Break)]
+        if temp is not None:
+            statements.append(store(temp, self.expression(condition)))
+        return statements + [node(_ast.Continue)]
+
+    def return_statement(self, line):
+        value = self.expression(line.expression)
+        if self.return_type is None:
+            return [statement(value), node(_ast.Return)]
+        value_type = self.inference.type_of(line.expression)
+        if value_type is None or not issubclass(value_type, self.return_type):
+            value = call('_check_return', value, type_name(self.return_type))
+        return [node(_ast.Return, value=value)]
+
+    def statement(self, line):
+        statements = []
+        if isinstance(line, (ast.Declaration, ast.DeclarationWithAssignment)):
+            statements += self.declaration(line)
+        if isinstance(line, (ast.Assignment, ast.DeclarationWithAssignment)):
+            statements += self.assignment(line)
+        elif isinstance(line, ast.FunctionDeclaration):
+            name = self.function_names[id(line)]
+            cache = node(_ast.Attribute, value=load(name), attr='cache', ctx=_ast.Load()) if line.pure else constant(None)
+            spec = node(_ast.Dict, keys=[constant('arguments'), constant('body'), constant('return_type'),
+                                         constant('cache')], values=[
+                node(_ast.List, ctx=_ast.Load(), elts=[
+                    node(_ast.Tuple, ctx=_ast.Load(), elts=[
+                        type_name(helpers.to_python_type(argument.type_name.name)), constant(argument.arg_name.name)
+                    ]) for argument in line.arguments.arguments
+                ]),
+                load(name),
+                type_name(helpers.to_python_type(line.return_type.name)),
+                cache,
+            ])
+            statements.append(statement(call('_declare_function', load('_functions'), constant(line.function_name.name), spec)))
+        elif isinstance(line, ast.FunctionCall):
+            statements.append(statement(self.expression(line)))
+        elif isinstance(line, ast.Print):
+            statements.append(statement(call('print', self.expression(line.expression))))
+        elif isinstance(line, ast.IfStatement):
+            statements.append(node(_ast.If, test=self.condition(line.condition), body=self.block(line.statement)))
+        elif isinstance(line, ast.IfElseStatement):
+            statements.append(node(_ast.If, test=self.condition(line.condition),
+                                   body=self.block(line.on_true_statement), orelse=self.block(line.on_false_statement)))
+        elif isinstance(line, ast.WhileStatement):
+            statements += self.while_statement(line)
+        return statements
+
+    def declaration(self, line):
+        name = line.var_name.name
+        if line.type_name.name == 'void':
+            return [statement(call('_void_variable'))]
+        previous = self.inference.declarations[id(line)]
+        if previous is None:
+            if isinstance(line, ast.DeclarationWithAssignment) and name not in helpers.get_accessed_variables(line.value):
+                return []
+            return [store(variable(name), constant(None))]
+        if previous.declared:
+            return [statement(call('_declare', constant(None), constant(name)))]
+        return [statement(call('_declare', load(variable(name)), constant(name))), store(variable(name), constant(None))]
+
+    def assignment(self, line):
+        name = line.var_name.name
+        value = self.expression(line.value)
+        target = self.inference.assignments[id(line)]
+        if target is None:
+            return [statement(call('_assign', load('_UNDECLARED'), value, load('object'), constant(name)))]
+        value_type = self.inference.type_of(line.value)
+        if not target.declared:
+            value = call('_assign', load(variable(name)), value, type_name(target.var_type), constant(name))
+        elif value_type is None or target.var_type is None or not issubclass(value_type, target.var_type):
+            value = call('_check_assign', value, type_name(target.var_type))
+        return [store(variable(name), value)]
+
+    def condition(self, expression):
+        value = self.expression(expression)
+        if self.inference.type_of(expression) is bool:
+            return value
+        return call('_check_bool', value)
+
+    def while_statement(self, line):
+        statements = []
+        condition = line.condition
+        if self.inference.type_of(condition) is bool:
+            test = self.expression(condition)
+            self.loops.append((len(self.blocks), None, condition))
+            body = self.block(line.statement)
+        else:
+            temp = self.temp()
+            statements.append(store(temp, self.condition(condition)))
+            self.loops.append((len(self.blocks), temp, condition))
+            body = self.block(line.statement) + [store(temp, self.expression(condition))]
+            test = load(temp)
+        self.loops.pop()
+        return statements + [node(_ast.While, test=test, body=body)]
+
+    def comparison(self, expression, left, right):
+        left_type = self.inference.type_of(expression.left)
+        right_type = self.inference.type_of(expression.right)
+        if inference.comparison_is_valid(left_type, right_type):
+            return node(_ast.Compare, left=left, ops=[_comparison_operators[expression.operation]()], comparators=[right])
+        return call(_comparison_helpers[expression.operation], left, right)
+
+    def expression(self, expression):
+        types = self.inference
+        if isinstance(expression, (ast.Number, ast.TrueOrFalse, ast.GenericExpression)):
+            return constant(expression.value)
+        if isinstance(expression, ast.String):
+            return constant(expression.text)
+        if isinstance(expression, ast.VariableRead):
+            read = types.reads[id(expression)]
+            if read is not None and read.declared and read.assigned:
+                return load(variable(expression.name))
+            return call('_read', load(variable(expression.name)), constant(expression.name))
+        if isinstance(expression, ast.BinaryMathOperator):
+            left, right = self.expression(expression.left), self.expression(expression.right)
+            if inference.math_is_valid(expression.operation, types.type_of(expression.left), types.type_of(expression.right)):
+                return node(_ast.BinOp, left=left, op=_binary_operators[expression.operation](), right=right)
+            return call(_math_helpers[expression.operation], left, right)
+        if isinstance(expression, ast.Comparison):
+            return self.comparison(expression, self.expression(expression.left), self.expression(expression.right))
+        if isinstance(expression, ast.BinaryLogicalOperator):
+            left, right = self.expression(expression.left), self.expression(expression.right)
+            if types.type_of(expression.left) is bool and types.type_of(expression.right) is bool:
+                op = _ast.BitAnd if expression.operation == '&&' else _ast.BitOr
+                return node(_ast.BinOp, left=left, op=op(), right=right)
+            return call('_logical_and' if expression.operation == '&&' else '_logical_or', left, right)
+        if isinstance(expression, ast.UnaryMathOperator):
+            operand = self.expression(expression.operand)
+            if types.type_of(expression.operand) in (int, float):
+                return node(_ast.UnaryOp, op=_ast.USub(), operand=operand)
+            return call('_negate', operand)
+        if isinstance(expression, ast.UnaryLogicalOperator):
+            operand = self.expression(expression.operand)
+            if types.type_of(expression.operand) is bool:
+                return node(_ast.UnaryOp, op=_ast.Not(), operand=operand)
+            return call('_not', operand)
+        if isinstance(expression, ast.IntToFloat):
+            number = self.expression(expression.number)
+            return call('float' if types.type_of(expression.number) is int else '_int_to_float', number)
+        if isinstance(expression, ast.FloatToInt):
+            number = self.expression(expression.number)
+            return call('int' if types.type_of(expression.number) is float else '_float_to_int', number)
+        if isinstance(expression, ast.FunctionCall):
+            return self.function_call(expression)
+        raise TypeError(f"Node {expression.get_symbol()} cannot be transpiled")
+
+    def function_call(self, expression):
+        name = expression.name.name
+        values = [self.expression(argument) for argument in expression.arguments.arguments]
+        summary = self.inference.functions.get(name)
+        declaration = summary.declaration if summary is not None else None
+        if declaration is None or len(declaration.arguments.arguments) != len(values):
+            function = call('_get_function', load('_functions'), constant(name))
+            return call('_call', function, constant(str(expression.name)), node(_ast.Tuple, elts=values, ctx=_ast.Load()))
+        function = node(_ast.IfExp, test=node(_ast.Compare, left=constant(name), ops=[_ast.In()], comparators=[load('_functions')]),
+                        body=load(self.function_names[id(declaration)]),
+                        orelse=call('_undeclared_function', constant(name)))
+        expected = [helpers.to_python_type(argument.type_name.name) for argument in declaration.arguments.arguments]
+        actual = [self.inference.type_of(argument) for argument in expression.arguments.arguments]
+        if expected == actual:
+            return call(function, *values)
+        checked = call('_check_arguments', node(_ast.Tuple, elts=values, ctx=_ast.Load()),
+                       node(_ast.Tuple, elts=[type_name(t) for t in expected], ctx=_ast.Load()))
+        return call(function, node(_ast.Starred, value=checked, ctx=_ast.Load()))
+
+
+def compile_program(root):
+    helpers.check_jumps(root)
+    return compile(Transpiler(root).transpile(), '<kublang>', 'exec')
+
+
+def run(code, name_table):
+    # the generated print statements call the output's print in place of the builtin
+    namespace = dict(runtime, print=name_table.output.print)
+    exec(code, namespace)
+    try:
+        namespace['_make'](name_table.functions)()
+    finally:
+        name_table.output.flush()
+
+
+def execute(root, name_table):
+    run(compile_program(root), name_table)
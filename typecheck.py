@@ -0,0 +1,221 @@
+import ast
+import helpers
+import inference
+
+_type_names = {int: 'int', float: 'float', str: 'string', bool: 'boolean', type(None): 'void'}
+
+
+class TypeCheckError(TypeError):
+    def __init__(self, errors):
+        super().__init__('\n'.join(errors))
+        self.errors = errors
+
+
+def _name(python_type):
+    return _type_names.get(python_type, python_type.__name__)
+
+
+def _get_returns(node):
+    if isinstance(node, ast.ReturnStatement):
+        yield node
+    elif not isinstance(node, ast.FunctionDeclaration):
+        for child in node.get_children():
+            yield from _get_returns(child)
+
+
+def _breaks(lines):
+    # whether a break in these lines ends the loop they are the body of; the statements of nested loops are skipped
+    for line in lines.lines:
+        if isinstance(line, ast.Break):
+            return True
+        if isinstance(line, ast.IfStatement) and _breaks(line.statement):
+            return True
+        if isinstance(line, ast.IfElseStatement) and (_breaks(line.on_true_statement) or
+                                                       _breaks(line.on_false_statement)):
+            return True
+    return False
+
+
+def _always_returns(lines):
+    for line in lines.lines:
+        if isinstance(line, ast.ReturnStatement):
+            return True
+        if isinstance(line, ast.IfElseStatement) and \
+                _always_returns(line.on_true_statement) and _always_returns(line.on_false_statement):
+            return True
+        # a loop that only a return can leave either returns or never finishes
+        if isinstance(line, ast.WhileStatement) and isinstance(line.condition, ast.TrueOrFalse) and \
+                line.condition.value is True and not _breaks(line.statement):
+            return True
+    return False
+
+
+class Checker:
+    def __init__(self, root, types=None):
+        self.root = root
+        self.types = types or inference.infer(root)
+        self.errors = []
+        self.loops = 0
+
+    def check(self):
+        self.visit(self.root)
+        return self.errors
+
+    def error(self, node, message):
+        self.errors.append(f'{node.get_symbol()}: {message}')
+
+    def known(self, node):
+        return self.types.type_of(node)
+
+    def visit(self, node):
+        self.check_node(node)
+        loops = self.loops
+        if isinstance(node, ast.FunctionDeclaration):
+            self.loops = 0
+        elif isinstance(node, ast.WhileStatement):
+            self.loops += 1
+        for child in node.get_children():
+            self.visit(child)
+        self.loops = loops
+
+    def check_node(self, node):
+        if isinstance(node, ast.BinaryMathOperator):
+            left, right = self.known(node.left), self.known(node.right)
+            if inference.math_is_valid(node.operation, left, right) is False:
+                self.error(node, f"operator '{node.operation}' cannot be applied to {_name(left)} and {_name(right)}")
+        elif isinstance(node, ast.Comparison):
+            left, right = self.known(node.left), self.known(node.right)
+            if inference.comparison_is_valid(left, right) is False:
+                self.error(node, f"operator '{node.operation}' cannot compare {_name(left)} and {_name(right)}")
+        elif isinstance(node, ast.BinaryLogicalOperator):
+            for operand in (node.left, node.right):
+                if self.known(operand) not in (None, bool):
+                    self.error(node, f"operator '{node.operation}' requires boolean operands, got {_name(self.known(operand))}")
+        elif isinstance(node, ast.UnaryMathOperator):
+            if self.known(node.operand) not in (None, int, float):
+                self.error(node, f"cannot negate {_name(self.known(node.operand))}")
+        elif isinstance(node, ast.UnaryLogicalOperator):
+            if self.known(node.operand) not in (None, bool):
+                self.error(node, f"operator '!' requires a boolean operand, got {_name(self.known(node.operand))}")
+        elif isinstance(node, ast.IntToFloat):
+            if self.known(node.number) not in (None, int):
+                self.error(node, f"inttofloat requires int, got {_name(self.known(node.number))}")
+        elif isinstance(node, ast.FloatToInt):
+            if self.known(node.number) not in (None, float):
+                self.error(node, f"floattoint requires float, got {_name(self.known(node.number))}")
+        elif isinstance(node, (ast.IfStatement, ast.IfElseStatement, ast.WhileStatement)):
+            if self.known(node.condition) not in (None, bool):
+                self.error(node, f"condition must be boolean, got {_name(self.known(node.condition))}")
+        elif isinstance(node, ast.VariableRead):
+            if id(node) not in self.types.reads:
+                return
+            read = self.types.reads[id(node)]
+            if read is None:
+                self.error(node, f"variable '{node.name}' was not declared")
+            elif read.declared and read.assigned is False:
+                self.error(node, f"variable '{node.name}' referenced before assignment")
+        elif isinstance(node, ast.FunctionCall):
+            self.check_function_call(node)
+        elif isinstance(node, ast.FunctionDeclaration):
+            self.check_function_declaration(node)
+        elif isinstance(node, (ast.Break, ast.Continue)):
+            if not self.loops:
+                self.error(node, f"'{node.get_symbol().lower()}' outside of a loop")
+        if isinstance(node, (ast.Declaration, ast.DeclarationWithAssignment)):
+            self.check_declaration(node)
+        if isinstance(node, (ast.Assignment, ast.DeclarationWithAssignment)):
+            self.check_assignment(node)
+
+    def check_declaration(self, node):
+        if node.type_name.name == 'void':
+            self.error(node, f"variable '{node.var_name.name}' cannot be of type void")
+        previous = self.types.declarations.get(id(node))
+        if previous is not None and previous.declared:
+            self.error(node, f"variable '{node.var_name.name}' was already declared")
+
+    def check_assignment(self, node):
+        if id(node) not in self.types.assignments:
+            return
+        target = self.types.assignments[id(node)]
+        if target is None:
+            # a void declaration with assignment is already reported by check_declaration
+            if not isinstance(node, ast.DeclarationWithAssignment):
+                self.error(node, f"variable '{node.var_name.name}' was not declared")
+            return
+        value_type = self.known(node.value)
+        if target.var_type is not None and value_type is not None and not issubclass(value_type, target.var_type):
+            self.error(node, f"cannot assign {_name(value_type)} to '{node.var_name.name}' of type {_name(target.var_type)}")
+
+    def check_function_call(self, node):
+        name = node.name.name
+        summary = self.types.functions.get(name)
+        if summary is None:
+            self.error(node, f"function '{name}' is never declared")
+            return
+        declaration = summary.declaration
+        if declaration is None:
+            return
+        parameters = declaration.arguments.arguments
+        if len(parameters) != len(node.arguments.arguments):
+            self.error(node, f"function '{name}' requires {len(parameters)} arguments but got {len(node.arguments.arguments)}")
+            return
+        for index, (parameter, argument) in enumerate(zip(parameters, node.arguments.arguments)):
+            expected, actual = helpers.to_python_type(parameter.type_name.name), self.known(argument)
+            if actual is not None and actual is not expected:
+                self.error(node, f"argument number {index} of '{name}' must be {_name(expected)}, got {_name(actual)}")
+
+    def check_function_declaration(self, node):
+        return_type = helpers.to_python_type(node.return_type.name)
+        for line in _get_returns(node.body):
+            value_type = self.known(line.expression)
+            if value_type is not None and not issubclass(value_type, return_type):
+                self.error(node, f"function '{node.function_name.name}' returns {_name(value_type)} "
+                                 f"but is declared {_name(return_type)}")
+        if return_type is not type(None) and not _always_returns(node.body):
+            self.error(node, f"function '{node.function_name.name}' can end without returning {_name(return_type)}")
+
+
+def check(root, types=None):
+    return Checker(root, types).check()
+
+
+def _specialize(types):
+    def specialize_node(node):
+        node_type = type(node)
+        if node_type is ast.BinaryMathOperator:
+            if inference.math_is_valid(node.operation, types.type_of(node.left), types.type_of(node.right)):
+                return ast.UncheckedBinaryMathOperator(node.operation, node.left, node.right)
+        elif node_type is ast.Comparison:
+            if inference.comparison_is_valid(types.type_of(node.left), types.type_of(node.right)):
+                return ast.UncheckedComparison(node.operation, node.left, node.right)
+        elif node_type is ast.BinaryLogicalOperator:
+            if types.type_of(node.left) is bool and types.type_of(node.right) is bool:
+                return ast.UncheckedBinaryLogicalOperator(node.operation, node.left, node.right)
+        elif node_type is ast.UnaryMathOperator:
+            if types.type_of(node.operand) in (int, float):
+                return ast.UncheckedUnaryMathOperator(node.operator, node.operand)
+        elif node_type is ast.UnaryLogicalOperator:
+            if types.type_of(node.operand) is bool:
+                return ast.UncheckedUnaryLogicalOperator(node.operator, node.operand)
+        elif node_type is ast.IntToFloat:
+            if types.type_of(node.number) is int:
+                return ast.UncheckedIntToFloat(node.number)
+        elif node_type is ast.FloatToInt:
+            if types.type_of(node.number) is float:
+                return ast.UncheckedFloatToInt(node.number)
+        elif node_type is ast.IfStatement:
+            if types.type_of(node.condition) is bool:
+                return ast.UncheckedIfStatement(node.condition, node.statement)
+        elif node_type is ast.IfElseStatement:
+            if types.type_of(node.condition) is bool:
+                return ast.UncheckedIfElseStatement(node.condition, node.on_true_statement, node.on_false_statement)
+        elif node_type is ast.WhileStatement:
+            if types.type_of(node.condition) is bool:
+                return ast.UncheckedWhileStatement(node.condition, node.statement)
+        return node
+    return specialize_node
+
+
+def specialize(root, types=None):
+    specialize_node = _specialize(types or inference.infer(root))
+    return helpers.transform(root, lambda node: specialize_node(node).locate(node))
@@ -0,0 +1,342 @@
+import sys
+
+import bytecode
+import helpers
+import limits
+import memo
+import names
+from bytecode import (
+    LOAD_CONST, LOAD_VAR, LOAD_TEMP, STORE_TEMP, STORE_VAR, DECLARE, POP,
+    BINARY_MATH, MATH_CONST, COMPARE, LOGICAL, NEGATE, NOT, INT_TO_FLOAT, FLOAT_TO_INT, CHECK_BOOL,
+    JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE, ENTER_SCOPE, EXIT_SCOPE, PRINT,
+    DECLARE_FUNCTION, LOAD_FUNCTION, CALL, RETURN,
+    LOAD_SLOT_SLOT, LOAD_SLOT_CONST, COMPARE_JUMP_IF_FALSE, COMPARE_JUMP_IF_TRUE,
+    TAIL_CALL, YIELD, CHARGE, LOAD_SLOT, STORE_SLOT, LOAD_SLOTS, STORE_SLOTS,
+)
+
+_math = [helpers.math_operation(operation) for operation in bytecode.math_operations] + \
+    [helpers.math_operators[operation] for operation in bytecode.math_operations]
+_compare = [helpers.comparison_operation(operation) for operation in bytecode.comparison_operations] + \
+    [helpers.comparison_operators[operation] for operation in bytecode.comparison_operations]
+
+
+def run(code, name_table, budget=None):
+    # code compiled without YIELDs finishes on the first step
+    steps = run_steps(code, name_table, budget=budget)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def run_steps(code, name_table, interval=1, budget=None):
+    # A generator that pauses once every interval YIELDs it executes, so a caller can interleave runs. The
+    # program's variables are left in the name table however the run ends, as the tree walker leaves them.
+    slots, slot_types = [None] * len(code.slot_names), [None] * len(code.slot_names)
+    try:
+        return (yield from _run_steps(code, name_table, slots, slot_types, interval, budget))
+    finally:
+        for index in range(code.scope_size):
+            if slot_types[index] is not None:
+                name_table.variables[0][code.slot_names[index]] = {'type': slot_types[index], 'value': slots[index]}
+
+
+def _run_steps(code, name_table, slots, slot_types, interval, budget):
+    # kublang calls never recurse in Python: the caller's state is saved on frames and the loop switches code
+    ticks = interval
+    # fuel is only charged by code compiled metered; the other limits hold for any code
+    fuel = max_depth = max_scopes = sys.maxsize
+    math_functions = _math
+    if budget is not None:
+        fuel = sys.maxsize if budget.fuel is None else budget.fuel
+        max_depth = sys.maxsize if budget.depth is None else budget.depth
+        max_scopes = sys.maxsize if budget.scopes is None else budget.scopes
+        if budget.string_length is not None:
+            math_functions = list(_math)
+            plus = bytecode.math_operations.index('+')
+            for index in (plus, plus + len(bytecode.math_operations)):
+                math_functions[index] = limits.limit_string_length(math_functions[index], budget.string_length)
+    # the scopes open in this frame and in the callers on frames
+    scopes, scopes_below = 1, 0
+    frames = []
+    # functions only see their own variables, which all live in slots, but share the functions declared so far
+    function_table = names.NameTable({}, output=name_table.output)
+    function_table.functions = functions = name_table.functions
+    ops, consts, code_names = code.ops, code.consts, code.names
+    stack = []
+    push, pop = stack.append, stack.pop
+    temps = [None] * code.temps
+    pc = 0
+    # the return types this frame's result is checked against, and where it is memoized
+    return_types, cache, key = (), None, None
+    while True:
+        op = ops[pc]
+        if op == LOAD_SLOT:
+            value = slots[ops[pc + 1]]
+            if value is None:
+                _unbound(code, slot_types, (ops[pc + 1],))
+            push(value)
+            pc += 2
+        elif op == LOAD_CONST:
+            push(consts[ops[pc + 1]])
+            pc += 2
+        elif op == MATH_CONST:
+            stack[-1] = math_functions[ops[pc + 1]](stack[-1], consts[ops[pc + 2]])
+            pc += 3
+        elif op == STORE_SLOT:
+            index = ops[pc + 1]
+            var_type = slot_types[index]
+            if var_type is None:
+                raise KeyError(f"'{code.slot_names[index]}' was not declared")
+            value = pop()
+            if not isinstance(value, var_type):
+                raise TypeError("Type mismatch between declared and assigned value")
+            slots[index] = value
+            pc += 2
+        elif op == COMPARE_JUMP_IF_FALSE:
+            r = pop()
+            if _compare[ops[pc + 1]](pop(), r):
+                pc += 3
+            else:
+                pc = ops[pc + 2]
+        elif op == LOAD_SLOT_CONST:
+            value = slots[ops[pc + 1]]
+            if value is None:
+                _unbound(code, slot_types, (ops[pc + 1],))
+            push(value)
+            push(consts[ops[pc + 2]])
+            pc += 3
+        elif op == COMPARE_JUMP_IF_TRUE:
+            r = pop()
+            if _compare[ops[pc + 1]](pop(), r):
+                pc = ops[pc + 2]
+            else:
+                pc += 3
+        elif op == ENTER_SCOPE:
+            if scopes_below + scopes >= max_scopes:
+                raise limits.BudgetExceeded('scopes', max_scopes)
+            scopes += 1
+            start, size = ops[pc + 1], ops[pc + 2]
+            if size:
+                slots[start:start + size] = slot_types[start:start + size] = [None] * size
+            pc += 3
+        elif op == EXIT_SCOPE:
+            scopes -= 1
+            pc += 1
+        elif op == JUMP:
+            pc = ops[pc + 1]
+        elif op == CHARGE:
+            fuel -= ops[pc + 1]
+            if fuel < 0:
+                raise limits.BudgetExceeded('fuel', budget.fuel)
+            pc += 2
+        elif op == BINARY_MATH:
+            r = pop()
+            stack[-1] = math_functions[ops[pc + 1]](stack[-1], r)
+            pc += 2
+        elif op == LOAD_FUNCTION:
+            function_spec = functions.get(consts[ops[pc + 1]])
+            if function_spec is None:
+                # raises the name table's error for a function that was never declared
+                name_table.get_function(consts[ops[pc + 1]])
+            push(function_spec)
+            pc += 2
+        elif op == CALL or op == TAIL_CALL:
+            argc = ops[pc + 1]
+            start = len(stack) - argc
+            function_spec, arguments = stack[start - 1], stack[start:]
+            del stack[start - 1:]
+            function_types = list(map(type, arguments))
+            if function_types != function_spec.get('types'):
+                _check_arguments(function_spec, function_types, consts[ops[pc + 2]])
+            padding = [None] * (len(function_spec['body'].slot_names) - argc)
+            function_slots = arguments + padding
+            function_types += padding
+            function_cache = function_spec['cache']
+            if function_cache is not None:
+                function_key = function_cache.key(arguments)
+                result = function_cache.get(function_key)
+                if result is not memo.MISSING:
+                    push(result)
+                    pc += 3
+                    continue
+            if op == CALL or cache is not None or function_cache is not None:
+                if len(frames) == max_depth:
+                    raise limits.BudgetExceeded('depth', max_depth)
+                frames.append((code, pc + 3, name_table, slots, slot_types, scopes, temps, return_types, cache, key))
+                scopes_below += scopes
+                return_types = (function_spec['return_type'],)
+            else:
+                # the callee replaces this frame, so its result must also pass the checks still pending here
+                return_type = function_spec['return_type']
+                return_types = (return_type,) + tuple(t for t in return_types if t is not return_type)
+            cache = function_cache
+            key = function_key if function_cache is not None else None
+            code = function_spec['body']
+            ops, consts, code_names = code.ops, code.consts, code.names
+            temps = [None] * code.temps
+            if scopes_below >= max_scopes:
+                raise limits.BudgetExceeded('scopes', max_scopes)
+            name_table, slots, slot_types, scopes = function_table, function_slots, function_types, 1
+            pc = 0
+        elif op == RETURN:
+            # callees share their caller's stack, and a return leaves nothing else on it, so the value stays put
+            value = stack[-1]
+            for return_type in return_types:
+                if not isinstance(value, return_type):
+                    raise TypeError(f"Value returned from function is of type {type(value)} but expected {return_type}")
+            if cache is not None:
+                cache.put(key, value)
+            if not frames:
+                return value
+            code, pc, name_table, slots, slot_types, scopes, temps, return_types, cache, key = frames.pop()
+            scopes_below -= scopes
+            ops, consts, code_names = code.ops, code.consts, code.names
+        elif op == LOAD_SLOT_SLOT:
+            value = slots[ops[pc + 1]]
+            if value is None:
+                _unbound(code, slot_types, (ops[pc + 1],))
+            push(value)
+            value = slots[ops[pc + 2]]
+            if value is None:
+                _unbound(code, slot_types, (ops[pc + 2],))
+            push(value)
+            pc += 3
+        elif op == COMPARE:
+            r = pop()
+            stack[-1] = _compare[ops[pc + 1]](stack[-1], r)
+            pc += 2
+        elif op == DECLARE:
+            var_name, type_name, index, visible = consts[ops[pc + 1]]
+            if type_name is None:
+                raise ValueError("Variables cannot be of type void")
+            if any(slot_types[slot] is not None for slot in visible) or \
+                    any(var_name in scope for scope in name_table.variables):
+                raise ValueError(f"Variable '{var_name}' was already declared")
+            slot_types[index] = helpers.to_python_type(type_name)
+            slots[index] = None
+            pc += 2
+        elif op == JUMP_IF_FALSE:
+            if pop():
+                pc += 2
+            else:
+                pc = ops[pc + 1]
+        elif op == JUMP_IF_TRUE:
+            if pop():
+                pc = ops[pc + 1]
+            else:
+                pc += 2
+        elif op == LOGICAL:
+            r = pop()
+            l = stack[-1]
+            helpers.check_boolean_type(l, r)
+            stack[-1] = (l and r) if ops[pc + 1] == 0 else (l or r)
+            pc += 2
+        elif op == CHECK_BOOL:
+            helpers.check_boolean_type(stack[-1])
+            pc += 1
+        elif op == FLOAT_TO_INT:
+            helpers.check_float_type(stack[-1])
+            stack[-1] = int(stack[-1])
+            pc += 1
+        elif op == INT_TO_FLOAT:
+            helpers.check_int_type(stack[-1])
+            stack[-1] = float(stack[-1])
+            pc += 1
+        elif op == NEGATE:
+            helpers.check_numeric_type(stack[-1])
+            stack[-1] = -stack[-1]
+            pc += 1
+        elif op == NOT:
+            helpers.check_boolean_type(stack[-1])
+            stack[-1] = not stack[-1]
+            pc += 1
+        elif op == POP:
+            pop()
+            pc += 1
+        elif op == PRINT:
+            name_table.output.print(pop())
+            pc += 1
+        elif op == LOAD_SLOTS:
+            # a name declared in more than one block around here; the innermost declaration that ran holds it
+            var_name, candidates = consts[ops[pc + 1]]
+            for index in candidates:
+                if slot_types[index] is not None:
+                    value = slots[index]
+                    if value is None:
+                        _unbound(code, slot_types, (index,))
+                    push(value)
+                    break
+            else:
+                _unbound(code, slot_types, candidates)
+            pc += 2
+        elif op == STORE_SLOTS:
+            var_name, candidates = consts[ops[pc + 1]]
+            for index in candidates:
+                if slot_types[index] is not None:
+                    value = pop()
+                    if not isinstance(value, slot_types[index]):
+                        raise TypeError("Type mismatch between declared and assigned value")
+                    slots[index] = value
+                    break
+            else:
+                raise KeyError(f"'{var_name}' was not declared")
+            pc += 2
+        elif op == LOAD_VAR:
+            push(name_table.get_variable(code_names[ops[pc + 1]]))
+            pc += 2
+        elif op == STORE_VAR:
+            name_table.assign_variable(code_names[ops[pc + 1]], pop())
+            pc += 2
+        elif op == LOAD_TEMP:
+            push(temps[ops[pc + 1]])
+            pc += 2
+        elif op == STORE_TEMP:
+            temps[ops[pc + 1]] = pop()
+            pc += 2
+        elif op == DECLARE_FUNCTION:
+            fun_name, arguments, body, return_type, pure = consts[ops[pc + 1]]
+            arguments = [(helpers.to_python_type(argument[0]), argument[1]) for argument in arguments]
+            name_table.declare_function(
+                fun_name=fun_name,
+                arguments=arguments,
+                body=body,
+                return_type=helpers.to_python_type(return_type),
+                cache=memo.FunctionCache(fun_name) if pure else None,
+            )
+            # the argument types as a call finds them, so it checks them with one comparison
+            name_table.functions[fun_name]['types'] = [argument_type for argument_type, _ in arguments]
+            pc += 2
+        elif op == YIELD:
+            ticks -= 1
+            if not ticks:
+                yield
+                ticks = interval
+            pc += 1
+        else:
+            raise ValueError(f"Unknown opcode {op} at {pc}")
+
+
+def _check_arguments(function_spec, actual_types, display_name):
+    # raises for arguments that do not match the declaration, which the call compared to the declared types at once
+    if (required := len(function_spec['arguments'])) != (provided := len(actual_types)):
+        raise ValueError(f"Function '{display_name}' requires {required} arguments but got {provided}")
+    for index, ((expected_type, _), actual_type) in enumerate(zip(function_spec['arguments'], actual_types)):
+        if expected_type != actual_type:
+            raise TypeError(f"Type mismatch in argument number {index}: expected {expected_type}, got {actual_type}")
+
+
+def _unbound(code, slot_types, candidates):
+    # raises what the name table raises for a variable that is not declared or has no value yet
+    var_name = code.slot_names[candidates[0]]
+    if any(slot_types[index] is not None for index in candidates):
+        raise ValueError(f"Variable '{var_name}' referenced before assignment")
+    raise KeyError(f"Variable '{var_name}' was not declared")
+
+
+def execute(root, name_table):
+    try:
+        run(bytecode.compile_program(root), name_table)
+    finally:
+        name_table.output.flush()